@@ -1,24 +1,34 @@
 from PIL import Image
-from collections import Counter
+import numpy as np
+
+from minecraft_skin_pixelart.color_matcher import ColorMatcher
 
 # Load the skin
 skin = Image.open('your_skin.png').convert('RGBA')
-pixels = list(skin.getdata())
+skin_arr = np.asarray(skin)
 
 # Filter out transparent pixels
-opaque_pixels = [p[:3] for p in pixels if p[3] > 128]
+opaque_pixels = skin_arr[skin_arr[..., 3] > 128][:, :3]
+
+# Get most common colors, counting 24-bit packed RGB keys
+keys = ColorMatcher.pack_colors(opaque_pixels)
+unique_keys, first_index, counts = np.unique(keys, return_index=True, return_counts=True)
+# Most frequent first, ties in order of first appearance (as Counter.most_common)
+top = np.lexsort((first_index, -counts))[:20]
+top_colors = ColorMatcher.unpack_colors(unique_keys[top])
+most_common = [(tuple(color), int(counts[i])) for color, i in zip(top_colors.tolist(), top)]
+
+# Per-color warmth and saturation
+rgb = top_colors.astype(np.int16)
+warmths = rgb[:, :2].mean(axis=1) - rgb[:, 2]
+saturations = np.ptp(rgb, axis=1)
 
-# Get most common colors
-color_counts = Counter(opaque_pixels)
 print("=== TOP 20 COLORS IN YOUR SKIN ===")
-for i, (color, count) in enumerate(color_counts.most_common(20), 1):
-    r, g, b = color
-    warmth = (r + g) / 2 - b
-    saturation = max(r, g, b) - min(r, g, b)
+for i, ((color, count), warmth, saturation) in enumerate(
+        zip(most_common, warmths.tolist(), saturations.tolist()), 1):
     print(f"{i:2d}. RGB{str(color):20s} count={count:5d} warmth={warmth:6.1f} sat={saturation:3d}")
 
 # Test with color matcher
-from minecraft_skin_pixelart.color_matcher import ColorMatcher
 from minecraft_skin_pixelart.block_palette import BlockPalette
 
 palette = BlockPalette('block')
@@ -26,7 +36,7 @@ palette.load_blocks()
 matcher = ColorMatcher(palette)
 
 print("\n=== MATCHING TOP 5 SKIN COLORS TO BLOCKS ===")
-for i, (color, count) in enumerate(color_counts.most_common(5), 1):
+for i, (color, count) in enumerate(most_common[:5], 1):
     block = matcher.find_closest_block(color + (255,))
     block_color = palette.average_colors[block]
     print(f"\n{i}. Skin color RGB{color} -> {block}")
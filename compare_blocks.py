@@ -28,10 +28,9 @@ img_height = block_size * 2
 img = Image.new('RGB', (img_width, img_height), color='white')
 
 # Draw skin color on top row
+swatch = Image.new('RGB', (block_size, block_size), skin_color)
 for i in range(len(candidates)):
-    for x in range(block_size):
-        for y in range(block_size):
-            img.putpixel((i * block_size + x, y), skin_color)
+    img.paste(swatch, (i * block_size, 0))
 
 # Draw block textures on bottom row
 for i, block_name in enumerate(candidates):
@@ -1,56 +1,51 @@
 from PIL import Image
-from collections import Counter
+import numpy as np
 
 print("=== COMPARING OLD vs NEW APPROACH ===\n")
 
 # Load outputs
 old = Image.open('output_improved.png').convert('RGBA')
 new = Image.open('output_unique.png').convert('RGBA')
+old_arr = np.asarray(old)
+new_arr = np.asarray(new)
 
-# Sample blocks from both
-old_blocks = set()
-new_blocks = set()
-
-for y in range(64):
-    for x in range(64):
-        ox = x * 16
-        oy = y * 16
-        
-        # Sample 9 pixels from each block to create signature
-        old_sig = tuple(old.getpixel((ox + dx, oy + dy))[:3] 
-                       for dy in [0, 8, 15] for dx in [0, 8, 15])
-        new_sig = tuple(new.getpixel((ox + dx, oy + dy))[:3] 
-                       for dy in [0, 8, 15] for dx in [0, 8, 15])
-        
-        # Only count non-transparent blocks
-        if old.getpixel((ox + 8, oy + 8))[3] >= 128:
-            old_blocks.add(old_sig)
-        if new.getpixel((ox + 8, oy + 8))[3] >= 128:
-            new_blocks.add(new_sig)
+# Sample 9 pixels (corners, edge midpoints, center) from each 16x16 block
+# to create a signature, and count the distinct signatures of blocks whose
+# center pixel is not transparent
+SAMPLE_OFFSETS = np.array([0, 8, 15])
+
+
+def unique_block_count(arr):
+    """Count distinct sampled block signatures in a 1024x1024 RGBA array."""
+    blocks = arr.reshape(64, 16, 64, 16, 4)
+    samples = blocks[:, SAMPLE_OFFSETS][:, :, :, SAMPLE_OFFSETS, :3]
+    signatures = samples.transpose(0, 2, 1, 3, 4).reshape(64, 64, 27)
+    opaque = blocks[:, 8, :, 8, 3] >= 128
+    return len(np.unique(signatures[opaque], axis=0))
+
+
+old_unique = unique_block_count(old_arr)
+new_unique = unique_block_count(new_arr)
 
 print(f"OLD approach (output_improved.png):")
-print(f"  Unique blocks used: {len(old_blocks)}")
+print(f"  Unique blocks used: {old_unique}")
 
 print(f"\nNEW approach (output_unique.png):")
-print(f"  Unique blocks used: {len(new_blocks)}")
+print(f"  Unique blocks used: {new_unique}")
 
 # Load skin to count unique colors
 skin = Image.open('your_skin.png').convert('RGBA')
-skin_colors = set()
-for y in range(64):
-    for x in range(64):
-        p = skin.getpixel((x, y))
-        if p[3] >= 128:
-            skin_colors.add(p[:3])
+skin_arr = np.asarray(skin)
+skin_colors = np.unique(skin_arr[skin_arr[..., 3] >= 128][:, :3], axis=0)
 
 print(f"\nSkin unique colors: {len(skin_colors)}")
 
 print("\n" + "="*50)
-if len(new_blocks) == len(skin_colors):
+if new_unique == len(skin_colors):
     print("✓✓✓ NEW: Perfect mapping - each color has unique block!")
 else:
-    print(f"✗ NEW: {len(skin_colors)} colors but {len(new_blocks)} blocks")
+    print(f"✗ NEW: {len(skin_colors)} colors but {new_unique} blocks")
 
-if len(old_blocks) < len(skin_colors):
-    print(f"✗ OLD: Only {len(old_blocks)} unique blocks for {len(skin_colors)} colors")
-    print(f"    ({len(skin_colors) - len(old_blocks)} colors shared blocks)")
+if old_unique < len(skin_colors):
+    print(f"✗ OLD: Only {old_unique} unique blocks for {len(skin_colors)} colors")
+    print(f"    ({len(skin_colors) - old_unique} colors shared blocks)")
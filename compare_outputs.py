@@ -1,41 +1,70 @@
 from PIL import Image
-from collections import Counter
+import numpy as np
+
+from minecraft_skin_pixelart.color_matcher import ColorMatcher
+
+
+def opaque_rgb(img):
+    """Return the RGB values of all opaque pixels as an (N, 3) array."""
+    arr = np.asarray(img)
+    return arr[arr[..., 3] > 128][:, :3]
+
+
+def most_common(rgb, n):
+    """Return the n most frequent colors as a list of (color, count)."""
+    # Count 24-bit packed RGB keys (a flat 1-D unique, much cheaper than
+    # np.unique over rows); key order matches (r, g, b) order
+    keys = ColorMatcher.pack_colors(rgb)
+    unique_keys, first_index, counts = np.unique(
+        keys, return_index=True, return_counts=True
+    )
+    # Most frequent first, ties in order of first appearance (as Counter.most_common)
+    top = np.lexsort((first_index, -counts))[:n]
+    top_colors = ColorMatcher.unpack_colors(unique_keys[top])
+    return [
+        (tuple(color), int(count))
+        for color, count in zip(top_colors.tolist(), counts[top].tolist())
+    ]
+
+
+def warmth_saturation(rgb):
+    """Return per-color warmth and saturation arrays for an (N, 3) array."""
+    rgb = np.asarray(rgb, dtype=np.int16).reshape(-1, 3)
+    warmth = rgb[:, :2].mean(axis=1) - rgb[:, 2]
+    saturation = np.ptp(rgb, axis=1)
+    return warmth, saturation
+
+
+def print_top_colors(rgb, n):
+    """Print the n most frequent colors with their warmth and saturation."""
+    top = most_common(rgb, n)
+    warmth, saturation = warmth_saturation([color for color, _ in top])
+    for i, ((color, count), w, sat) in enumerate(
+            zip(top, warmth.tolist(), saturation.tolist()), 1):
+        print(f"{i:2d}. RGB{str(color):20s} count={count:5d} warmth={w:6.1f} sat={sat:3d}")
+
 
 # Load both outputs
 old = Image.open('output_fixed.png').convert('RGBA')
 new = Image.open('output_improved.png').convert('RGBA')
 
-# Get pixel data
-old_pixels = list(old.getdata())
-new_pixels = list(new.getdata())
-
 # Count opaque pixels
-old_opaque = [p[:3] for p in old_pixels if p[3] > 128]
-new_opaque = [p[:3] for p in new_pixels if p[3] > 128]
-
-# Get most common colors
-old_colors = Counter(old_opaque)
-new_colors = Counter(new_opaque)
+old_opaque = opaque_rgb(old)
+new_opaque = opaque_rgb(new)
 
 print("=== OLD OUTPUT (output_fixed.png) ===")
 print("Top 10 colors:")
-for i, (color, count) in enumerate(old_colors.most_common(10), 1):
-    r, g, b = color
-    warmth = (r + g) / 2 - b
-    saturation = max(r, g, b) - min(r, g, b)
-    print(f"{i:2d}. RGB{str(color):20s} count={count:5d} warmth={warmth:6.1f} sat={saturation:3d}")
+print_top_colors(old_opaque, 10)
 
 print("\n=== NEW OUTPUT (output_improved.png) ===")
 print("Top 10 colors:")
-for i, (color, count) in enumerate(new_colors.most_common(10), 1):
-    r, g, b = color
-    warmth = (r + g) / 2 - b
-    saturation = max(r, g, b) - min(r, g, b)
-    print(f"{i:2d}. RGB{str(color):20s} count={count:5d} warmth={warmth:6.1f} sat={saturation:3d}")
+print_top_colors(new_opaque, 10)
 
 # Compare
+old_warmth, old_saturation = warmth_saturation(old_opaque)
+new_warmth, new_saturation = warmth_saturation(new_opaque)
 print("\n=== COMPARISON ===")
-print(f"Old average warmth: {sum((r+g)/2-b for r,g,b in old_opaque)/len(old_opaque):.1f}")
-print(f"New average warmth: {sum((r+g)/2-b for r,g,b in new_opaque)/len(new_opaque):.1f}")
-print(f"Old average saturation: {sum(max(r,g,b)-min(r,g,b) for r,g,b in old_opaque)/len(old_opaque):.1f}")
-print(f"New average saturation: {sum(max(r,g,b)-min(r,g,b) for r,g,b in new_opaque)/len(new_opaque):.1f}")
+print(f"Old average warmth: {old_warmth.mean():.1f}")
+print(f"New average warmth: {new_warmth.mean():.1f}")
+print(f"Old average saturation: {old_saturation.mean():.1f}")
+print(f"New average saturation: {new_saturation.mean():.1f}")
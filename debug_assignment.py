@@ -1,4 +1,5 @@
 from PIL import Image
+import numpy as np
 from minecraft_skin_pixelart.block_palette import BlockPalette
 from minecraft_skin_pixelart.color_matcher import ColorMatcher
 from collections import Counter
@@ -6,19 +7,14 @@ from collections import Counter
 # Load skin
 skin = Image.open('your_skin.png').convert('RGBA')
 
-# Get unique colors
-unique_colors = set()
-color_frequency = {}
-for y in range(64):
-    for x in range(64):
-        pixel_color = skin.getpixel((x, y))
-        if len(pixel_color) >= 4 and pixel_color[3] >= 128:
-            rgb = pixel_color[:3]
-            unique_colors.add(rgb)
-            color_frequency[rgb] = color_frequency.get(rgb, 0) + 1
+# Get unique colors with their frequencies
+skin_arr = np.asarray(skin)
+opaque = skin_arr[skin_arr[..., 3] >= 128][:, :3]
+colors, counts = np.unique(opaque, axis=0, return_counts=True)
+color_frequency = dict(zip(map(tuple, colors.tolist()), counts.tolist()))
 
 # Sort by frequency
-sorted_colors = sorted(unique_colors, key=lambda c: color_frequency[c], reverse=True)
+sorted_colors = sorted(color_frequency, key=lambda c: color_frequency[c], reverse=True)
 
 print(f"Total unique colors: {len(sorted_colors)}")
 
@@ -29,25 +25,27 @@ matcher = ColorMatcher(palette)
 
 print(f"Total available blocks: {len(palette.blocks)}")
 
+# Distances from every skin color to every block in one pass
+block_names, block_colors = palette.get_all_blocks_array()
+distances = ColorMatcher.color_distance_ciede2000_matrix(
+    sorted_colors, block_terms=palette.distance_terms
+)
+
 # Simulate assignment
 color_to_block = {}
 used_blocks = set()
+used_mask = np.zeros(len(block_names), dtype=bool)
 
 for i, color in enumerate(sorted_colors, 1):
-    # Find best unused block
-    all_blocks = palette.get_all_blocks()
-    candidates = []
-    
-    for block_name, block_color in all_blocks:
-        if block_name not in used_blocks:
-            distance = matcher.color_distance_ciede2000(color, block_color)
-            candidates.append((distance, block_name, block_color))
-    
-    if candidates:
-        candidates.sort(key=lambda x: x[0])
-        best_distance, best_block, best_color = candidates[0]
+    # Find best unused block (argmin keeps the first block in palette order on ties)
+    if not used_mask.all():
+        best_index = int(np.argmin(np.where(used_mask, np.inf, distances[i - 1])))
+        best_distance = distances[i - 1, best_index]
+        best_block = block_names[best_index]
+        best_color = tuple(block_colors[best_index].tolist())
         color_to_block[color] = best_block
         used_blocks.add(best_block)
+        used_mask[best_index] = True
         
         if i <= 15:
             print(f"{i:2d}. RGB{color} ({color_frequency[color]:3d} px) -> {best_block:30s} RGB{best_color} dist={best_distance:.1f}")
@@ -5,10 +5,8 @@ A tool to convert Minecraft skins (64x64) into pixelart using block textures (10
 Also supports Minecraft capes (64x32) conversion to pixelart (1024x512).
 """
 
-from .block_palette import BlockPalette
-from .color_matcher import ColorMatcher
-from .skin_processor import SkinProcessor
-from .cape_processor import CapeProcessor
+from importlib import import_module
+
 from .exceptions import (
     MinecraftSkinPixelartError,
     InvalidImageError,
@@ -21,6 +19,15 @@ from .exceptions import (
 
 __version__ = "0.1.0"
 
+# The processing classes pull in NumPy, Pillow and (optionally) numba, so
+# they are imported on first access rather than with the package
+_LAZY_IMPORTS = {
+    'BlockPalette': '.block_palette',
+    'ColorMatcher': '.color_matcher',
+    'SkinProcessor': '.skin_processor',
+    'CapeProcessor': '.cape_processor',
+}
+
 __all__ = [
     'BlockPalette',
     'ColorMatcher',
@@ -34,3 +41,12 @@ __all__ = [
     'ProcessingError',
     'OutputSaveError',
 ]
+
+
+def __getattr__(name):
+    """Import the processing classes on first access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
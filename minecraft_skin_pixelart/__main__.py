@@ -6,16 +6,6 @@ import argparse
 import sys
 import os
 
-# Set UTF-8 encoding for stdout/stderr on Windows
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-
-from .block_palette import BlockPalette
-from .color_matcher import ColorMatcher
-from .skin_processor import SkinProcessor
-from .cape_processor import CapeProcessor
 from .exceptions import (
     MinecraftSkinPixelartError,
     InvalidImageError,
@@ -85,6 +75,10 @@ Examples:
             print(f"Error: Blocks directory not found: {args.blocks_dir}")
             sys.exit(1)
         
+        # Imported here so --help and argument errors skip loading NumPy/Pillow
+        from .block_palette import BlockPalette
+        from .color_matcher import ColorMatcher
+        
         palette = BlockPalette(args.blocks_dir)
         palette.load_blocks()
         
@@ -99,11 +93,13 @@ Examples:
         # Step 3: Initialize processor
         if args.cape:
             print("\n[3/4] Processing cape...")
+            from .cape_processor import CapeProcessor
             processor = CapeProcessor(palette, matcher)
             item_type = "cape"
             default_output = "minecraft_cape_output.png"
         else:
             print("\n[3/4] Processing skin...")
+            from .skin_processor import SkinProcessor
             processor = SkinProcessor(palette, matcher)
             item_type = "skin"
             default_output = "minecraft_skin_output.png"
@@ -205,4 +201,9 @@ Examples:
 
 
 if __name__ == '__main__':
+    # Set UTF-8 encoding for stdout/stderr on Windows; done only when run as a
+    # script so importing main() (e.g. in tests) leaves the caller's streams alone
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
     sys.exit(main())
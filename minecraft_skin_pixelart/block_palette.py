@@ -3,14 +3,20 @@ BlockPalette module for loading and managing Minecraft block textures.
 """
 
 import os
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from PIL import Image
 import logging
 
+from .color_matcher import ColorMatcher
 from .exceptions import BlockDirectoryNotFoundError, BlockPaletteEmptyError
 
 logger = logging.getLogger(__name__)
 
+# Side length in pixels of one block in the rendered output
+BLOCK_SIZE = 16
+
 
 class BlockPalette:
     """Manages loading and indexing of Minecraft block textures."""
@@ -25,6 +31,19 @@ class BlockPalette:
         self.blocks_directory = blocks_directory
         self.blocks: Dict[str, Image.Image] = {}
         self.average_colors: Dict[str, Tuple[int, int, int]] = {}
+        # Same data as average_colors laid out for vectorized matching:
+        # block_names[i] has average color avg_colors_array[i]
+        self.block_names: List[str] = []
+        # Position of each block name in block_names
+        self.block_index: Dict[str, int] = {}
+        self.avg_colors_array: np.ndarray = np.empty((0, 3), dtype=np.uint8)
+        # Block-side terms of the color distance, see ColorMatcher.block_distance_terms
+        self.distance_terms: dict = ColorMatcher.block_distance_terms(self.avg_colors_array)
+        # textures_array[i] is the RGBA texture of block_names[i] as a
+        # BLOCK_SIZE x BLOCK_SIZE tile, used to render whole images at once
+        self.textures_array: np.ndarray = np.empty(
+            (0, BLOCK_SIZE, BLOCK_SIZE, 4), dtype=np.uint8
+        )
     
     def load_blocks(self) -> None:
         """Load all block textures and compute their average colors."""
@@ -39,39 +58,78 @@ class BlockPalette:
                 f"Path is not a directory: {self.blocks_directory}"
             )
         
-        # Load all PNG files from the directory
+        # Collect all PNG files from the directory, sorted so the palette
+        # order (and so tie breaking between equal blocks) does not depend
+        # on the order the filesystem happens to list them in
+        png_files = sorted(
+            filename for filename in os.listdir(self.blocks_directory)
+            if filename.lower().endswith('.png')
+        )
+        
+        # Decode textures in parallel (Pillow releases the GIL while decoding).
+        # Results come back in file order and are stored on this thread.
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(self._load_block, png_files))
+        
         loaded_count = 0
-        for filename in os.listdir(self.blocks_directory):
-            if not filename.lower().endswith('.png'):
+        for result in results:
+            if result is None:
                 continue
             
-            filepath = os.path.join(self.blocks_directory, filename)
-            block_name = os.path.splitext(filename)[0]
-            
-            try:
-                # Load the image
-                texture = Image.open(filepath)
-                # Convert to RGBA to ensure consistent format
-                texture = texture.convert('RGBA')
-                
-                # Store the texture
-                self.blocks[block_name] = texture
-                
-                # Calculate and store average color
-                avg_color = self._calculate_average_color(texture)
-                self.average_colors[block_name] = avg_color
-                
-                loaded_count += 1
-            except Exception as e:
-                # Skip invalid files and log warning
-                logger.warning(f"Skipping invalid block texture {filename}: {e}")
-                continue
+            block_name, texture, avg_color = result
+            self.blocks[block_name] = texture
+            self.average_colors[block_name] = avg_color
+            loaded_count += 1
         
         # Check if any blocks were loaded
         if loaded_count == 0:
             raise BlockPaletteEmptyError(
                 f"No block textures found in directory: {self.blocks_directory}"
             )
+        
+        self.block_names = list(self.blocks.keys())
+        self.block_index = {name: i for i, name in enumerate(self.block_names)}
+        self.avg_colors_array = np.array(
+            [self.average_colors[name] for name in self.block_names], dtype=np.uint8
+        )
+        self.distance_terms = ColorMatcher.block_distance_terms(self.avg_colors_array)
+        self.textures_array = np.stack(
+            [self._texture_tile(self.blocks[name]) for name in self.block_names]
+        )
+    
+    def _load_block(
+        self, filename: str
+    ) -> Optional[Tuple[str, Image.Image, Tuple[int, int, int]]]:
+        """
+        Load a single block texture and compute its average color.
+        
+        Args:
+            filename: Name of the PNG file inside the blocks directory
+            
+        Returns:
+            Tuple of (block_name, texture, average_color), or None if the
+            file is not a valid image
+        """
+        filepath = os.path.join(self.blocks_directory, filename)
+        block_name = os.path.splitext(filename)[0]
+        
+        try:
+            # Load the image, closing the file as soon as its pixels are decoded
+            with Image.open(filepath) as texture:
+                # Convert to RGBA to ensure consistent format (convert() copies
+                # the pixels even when the mode already matches, so skip it then)
+                if texture.mode != 'RGBA':
+                    texture = texture.convert('RGBA')
+                texture.load()
+            
+            # Calculate average color
+            avg_color = self._calculate_average_color(texture)
+        except Exception as e:
+            # Skip invalid files and log warning
+            logger.warning(f"Skipping invalid block texture {filename}: {e}")
+            return None
+        
+        return block_name, texture, avg_color
     
     def _calculate_average_color(self, texture: Image.Image) -> Tuple[int, int, int]:
         """
@@ -84,36 +142,84 @@ class BlockPalette:
         Returns:
             Tuple of (r, g, b) representing the average color
         """
-        # Get all pixel data with alpha
-        pixels = list(texture.getdata())
+        # RGB textures carry no alpha channel and count as fully opaque
+        if texture.mode not in ('RGB', 'RGBA'):
+            texture = texture.convert('RGBA')
         
-        # Calculate weighted average for each channel
-        r_sum = 0
-        g_sum = 0
-        b_sum = 0
-        weight_sum = 0
+        # Fully opaque textures (alpha range checked in C by Pillow) need no
+        # weighting, the average is a plain integer per-channel mean
+        if texture.mode == 'RGB' or texture.getextrema()[3][0] == 255:
+            rgb = np.asarray(texture)[..., :3].reshape(-1, 3)
+            rgb_mean = rgb.sum(axis=0) / len(rgb)
+            avg_r, avg_g, avg_b = (round(c) for c in rgb_mean.tolist())
+            return (avg_r, avg_g, avg_b)
         
-        for pixel in pixels:
-            r, g, b, a = pixel
-            
-            # Use alpha as weight (fully transparent pixels contribute nothing)
-            weight = a / 255.0
-            
-            r_sum += r * weight
-            g_sum += g * weight
-            b_sum += b * weight
-            weight_sum += weight
+        pixels = np.asarray(texture, dtype=np.float64).reshape(-1, len(texture.mode))
+        
+        # Use alpha as weight (fully transparent pixels contribute nothing)
+        if texture.mode == 'RGBA':
+            weights = pixels[:, 3] / 255.0
+        else:
+            weights = np.ones(len(pixels))
+        
+        weight_sum = weights.sum()
         
         # Avoid division by zero for fully transparent textures
         if weight_sum == 0:
             return (0, 0, 0)
         
-        avg_r = round(r_sum / weight_sum)
-        avg_g = round(g_sum / weight_sum)
-        avg_b = round(b_sum / weight_sum)
+        rgb_sum = (pixels[:, :3] * weights[:, None]).sum(axis=0)
+        avg_r, avg_g, avg_b = (round(c) for c in (rgb_sum / weight_sum).tolist())
         
         return (avg_r, avg_g, avg_b)
     
+    @staticmethod
+    def _texture_tile(texture: Image.Image) -> np.ndarray:
+        """
+        Convert a texture to a BLOCK_SIZE x BLOCK_SIZE RGBA tile, the area it
+        covers when pasted at a block position. Smaller textures are padded
+        with transparent pixels, larger ones cropped to their top-left corner.
+        
+        Args:
+            texture: PIL Image in RGBA mode
+            
+        Returns:
+            uint8 array of shape (BLOCK_SIZE, BLOCK_SIZE, 4)
+        """
+        tile = np.zeros((BLOCK_SIZE, BLOCK_SIZE, 4), dtype=np.uint8)
+        pixels = np.asarray(texture)[:BLOCK_SIZE, :BLOCK_SIZE]
+        tile[:pixels.shape[0], :pixels.shape[1]] = pixels
+        return tile
+    
+    def render_blocks(self, block_map: np.ndarray) -> Image.Image:
+        """
+        Render a grid of blocks into one image in a single array operation.
+        
+        Args:
+            block_map: 2D integer array of indices into block_names; negative
+                entries leave their cell transparent
+            
+        Returns:
+            RGBA image of size (columns * BLOCK_SIZE, rows * BLOCK_SIZE)
+        """
+        rows, columns = block_map.shape
+        
+        # Nothing to paste (empty or unloaded palette, or every cell empty)
+        if len(self.textures_array) == 0 or not (block_map >= 0).any():
+            return Image.fromarray(
+                np.zeros((rows * BLOCK_SIZE, columns * BLOCK_SIZE, 4), dtype=np.uint8)
+            )
+        
+        # Gather one tile per cell, (rows, columns, 16, 16, 4), and blank empty cells
+        tiles = self.textures_array[np.maximum(block_map, 0)]
+        tiles[block_map < 0] = 0
+        
+        # Interleave tile rows with pixel rows to lay the tiles out as an image
+        pixels = tiles.transpose(0, 2, 1, 3, 4).reshape(
+            rows * BLOCK_SIZE, columns * BLOCK_SIZE, 4
+        )
+        return Image.fromarray(pixels)
+    
     def get_block_texture(self, block_name: str) -> Image.Image:
         """
         Get the texture for a specific block.
@@ -129,6 +235,21 @@ class BlockPalette:
         """
         return self.blocks[block_name]
     
+    def get_block_texture_array(self, block_name: str) -> np.ndarray:
+        """
+        Get the texture for a specific block as a tile of textures_array.
+        
+        Args:
+            block_name: Name of the block
+            
+        Returns:
+            View of the block's (BLOCK_SIZE, BLOCK_SIZE, 4) uint8 RGBA tile
+            
+        Raises:
+            KeyError: If block_name is not found in the palette
+        """
+        return self.textures_array[self.block_index[block_name]]
+    
     def get_all_blocks(self) -> List[Tuple[str, Tuple[int, int, int]]]:
         """
         Get all blocks with their average colors.
@@ -137,3 +258,13 @@ class BlockPalette:
             List of tuples (block_name, average_color)
         """
         return [(name, self.average_colors[name]) for name in self.blocks.keys()]
+    
+    def get_all_blocks_array(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Get all block names with their average colors as a NumPy array.
+        
+        Returns:
+            Tuple (block_names, colors) where colors is an (N, 3) uint8 array
+            and colors[i] is the average color of block_names[i]
+        """
+        return self.block_names, self.avg_colors_array
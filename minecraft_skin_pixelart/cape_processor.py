@@ -2,6 +2,7 @@
 CapeProcessor module for coordinating the cape conversion process.
 """
 
+import numpy as np
 from PIL import Image
 from .exceptions import (
     InvalidDimensionsError,
@@ -50,7 +51,8 @@ class CapeProcessor:
                     )
                 
                 # Convert to RGBA for consistent processing and load into memory
-                cape = cape.convert('RGBA')
+                if cape.mode != 'RGBA':
+                    cape = cape.convert('RGBA')
                 cape.load()
                 
                 return cape
@@ -64,9 +66,10 @@ class CapeProcessor:
     def process_cape(self, cape: Image.Image) -> Image.Image:
         """
         Process the cape and create a 1024x512 output image.
-        Uses a two-pass approach:
-        1. First pass: collect all unique colors in the cape
-        2. Second pass: assign unique blocks to each color and render
+        Reads the cape once:
+        1. Collect all unique colors in the cape with their counts
+        2. Assign unique blocks to each color, most frequent first
+        3. Render by mapping every pixel to its color's block
         
         Args:
             cape: Input cape image (64x32)
@@ -76,119 +79,56 @@ class CapeProcessor:
         """
         print("      • Analyzing unique colors in cape...", flush=True)
         
-        # PASS 1: Collect all unique colors
-        unique_colors = set()
-        for y in range(32):
-            for x in range(64):
-                pixel_color = cape.getpixel((x, y))
-                # Only include opaque pixels
-                if len(pixel_color) >= 4 and pixel_color[3] >= 128:
-                    unique_colors.add(pixel_color[:3])  # Store RGB only
+        # Read all pixels at once instead of one getpixel() call per pixel
+        if cape.mode != 'RGBA':
+            cape = cape.convert('RGBA')
+        pixels = np.asarray(cape)
+        
+        # Unique colors of opaque pixels (packed into single integers), their
+        # first position and count, and each opaque pixel's unique color index
+        opaque = pixels[..., 3] >= 128
+        packed = self.color_matcher.pack_colors(pixels[opaque][:, :3])
+        unique_colors, first_index, inverse, counts = np.unique(
+            packed, return_index=True, return_inverse=True, return_counts=True
+        )
         
         print(f"      • Found {len(unique_colors)} unique colors", flush=True)
         print("      • Assigning unique blocks to each color...", flush=True)
         
-        # PASS 2: Assign a unique block to each unique color
-        color_to_block = {}
-        used_blocks = set()
-        
-        # Sort colors by frequency (most common first) for better block assignment
-        color_frequency = {}
-        for y in range(32):
-            for x in range(64):
-                pixel_color = cape.getpixel((x, y))
-                if len(pixel_color) >= 4 and pixel_color[3] >= 128:
-                    rgb = pixel_color[:3]
-                    color_frequency[rgb] = color_frequency.get(rgb, 0) + 1
-        
-        # Sort by frequency (descending)
-        sorted_colors = sorted(unique_colors, key=lambda c: color_frequency[c], reverse=True)
-        
-        # Get all available blocks sorted by their suitability for each color
-        for color in sorted_colors:
-            # Find the best unused block for this color
-            best_block = self._find_best_unused_block(color, used_blocks)
-            if best_block:
-                color_to_block[color] = best_block
-                used_blocks.add(best_block)
-        
-        print(f"      • Assigned {len(color_to_block)} blocks", flush=True)
-        
-        # PASS 3: Render the output image
-        print("      • Rendering output image...", flush=True)
-        output = Image.new('RGBA', (1024, 512), (0, 0, 0, 0))
+        # Assign a unique block to each unique color
+        color_blocks = np.full(len(unique_colors), -1, dtype=np.intp)
         
-        total_pixels = 64 * 32
-        processed = 0
+        # Sort colors by frequency (most common first) for better block assignment;
+        # equally frequent colors keep the order they first appear in
+        order = np.lexsort((first_index, -counts))
         
-        # Iterate over each pixel in the 64x32 cape
-        for y in range(32):
-            for x in range(64):
-                # Get the pixel color at position (x, y)
-                pixel_color = cape.getpixel((x, y))
-                
-                # Skip transparent pixels
-                if len(pixel_color) >= 4 and pixel_color[3] < 128:
-                    processed += 1
-                    continue
-                
-                # Get RGB color
-                rgb = pixel_color[:3]
-                
-                # Get the assigned block for this color
-                block_name = color_to_block.get(rgb)
-                
-                if block_name is None:
-                    processed += 1
-                    continue
-                
-                # Get the block texture
-                block_texture = self.block_palette.get_block_texture(block_name)
-                
-                # Calculate position in output image (x*16, y*16)
-                output_x = x * 16
-                output_y = y * 16
-                
-                # Paste the block texture at the calculated position
-                output.paste(block_texture, (output_x, output_y))
-                
-                processed += 1
-                
-                # Print progress every 256 pixels
-                if processed % 256 == 0:
-                    progress = (processed / total_pixels) * 100
-                    print(f"      • Progress: {progress:.1f}% ({processed}/{total_pixels} pixels)", flush=True)
+        # Distances from every color to every block, computed once
+        distances = self.color_matcher.color_distance_ciede2000_matrix(
+            self.color_matcher.unpack_colors(unique_colors[order]),
+            block_terms=self.block_palette.distance_terms,
+        )
         
-        return output
-    
-    def _find_best_unused_block(self, color, used_blocks):
-        """
-        Find the best matching block for a color that hasn't been used yet.
+        # Greedily give each color its closest unused block (ties go to the
+        # first block in palette order) until the palette runs out; used
+        # blocks are tracked by index in a boolean mask
+        block_count = len(self.block_palette.block_names)
+        available = np.ones(block_count, dtype=bool)
+        for row, color_index in zip(distances[:block_count], order.tolist()):
+            best_block = int(np.argmin(np.where(available, row, np.inf)))
+            color_blocks[color_index] = best_block
+            available[best_block] = False
         
-        Args:
-            color: RGB tuple
-            used_blocks: Set of already used block names
-            
-        Returns:
-            Best matching unused block name, or None if all blocks are used
-        """
-        # Get all blocks with their distances
-        all_blocks = self.block_palette.get_all_blocks()
-        
-        # Calculate distances and filter out used blocks
-        candidates = []
-        for block_name, block_color in all_blocks:
-            if block_name not in used_blocks:
-                distance = self.color_matcher.color_distance_ciede2000(color, block_color)
-                candidates.append((distance, block_name))
-        
-        # If no unused blocks available, return None
-        if not candidates:
-            return None
-        
-        # Sort by distance and return the closest
-        candidates.sort(key=lambda x: x[0])
-        return candidates[0][1]
+        print(f"      • Assigned {np.count_nonzero(color_blocks >= 0)} blocks", flush=True)
+        
+        # Render the output image: every opaque pixel takes its color's block
+        print("      • Rendering output image...", flush=True)
+        block_map = np.full(opaque.shape, -1, dtype=np.intp)
+        block_map[opaque] = color_blocks[inverse.reshape(-1)]
+        
+        # Paste all block textures in one step
+        output = self.block_palette.render_blocks(block_map)
+        
+        return output
     
     def save_output(self, output_image: Image.Image, output_path: str = None) -> None:
         """
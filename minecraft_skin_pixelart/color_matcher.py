@@ -5,6 +5,96 @@ ColorMatcher module for finding the closest block color to a given pixel.
 import math
 from typing import Tuple, Optional
 
+import numpy as np
+
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel then runs as plain Python
+    njit = None
+
+
+def _color_distance_kernel(r1, g1, b1, r2, g2, b2):
+    """
+    Scalar body of ColorMatcher.color_distance_ciede2000 on unpacked channels.
+    Compiled with numba when it is installed.
+    """
+    # Work in floats so unsigned channel values cannot wrap on subtraction
+    r1 = float(r1)
+    g1 = float(g1)
+    b1 = float(b1)
+    r2 = float(r2)
+    g2 = float(g2)
+    b2 = float(b2)
+    
+    # Calculate average red
+    r_mean = (r1 + r2) / 2
+    
+    # Calculate differences
+    delta_r = r1 - r2
+    delta_g = g1 - g2
+    delta_b = b1 - b2
+    
+    # Weighted Euclidean distance that accounts for human perception
+    # Red perception varies based on average red value
+    weight_r = 2 + r_mean / 256
+    weight_g = 4.0
+    weight_b = 2 + (255 - r_mean) / 256
+    
+    distance = math.sqrt(
+        weight_r * delta_r * delta_r +
+        weight_g * delta_g * delta_g +
+        weight_b * delta_b * delta_b
+    )
+    
+    # Add penalty for warm vs cool color mismatch
+    # This helps distinguish beige/tan colors from gray colors
+    warmth1 = (r1 + g1) / 2 - b1  # Positive for warm colors
+    warmth2 = (r2 + g2) / 2 - b2
+    
+    # Calculate saturation (how colorful vs gray)
+    sat1 = max(r1, g1, b1) - min(r1, g1, b1)
+    sat2 = max(r2, g2, b2) - min(r2, g2, b2)
+    
+    # Penalty for warmth mismatch - but only if signs differ (warm vs cool)
+    # Don't penalize if both are warm or both are cool, just different amounts
+    if (warmth1 > 5 and warmth2 < -5) or (warmth1 < -5 and warmth2 > 5):
+        # Strong penalty for warm-to-cool or cool-to-warm mismatch
+        warmth_penalty = abs(warmth1 - warmth2) * 0.8
+    else:
+        # Light penalty for same-category warmth differences
+        warmth_penalty = abs(warmth1 - warmth2) * 0.2
+    
+    # Penalty for saturation mismatch (colorful vs gray)
+    # Increased to better distinguish saturated skin tones from gray blocks
+    saturation_penalty = abs(sat1 - sat2) * 0.5
+    
+    # For medium-brightness colors (likely skin tones), strongly prefer warmer blocks
+    # over gray blocks even if they're slightly further in pure RGB distance
+    brightness1 = (r1 + g1 + b1) / 3
+    
+    # If source is medium brightness (50-200) with some saturation, penalize gray/cool blocks
+    if 50 < brightness1 < 200 and sat1 > 15:
+        # If target block is gray (low saturation) and cool (low warmth)
+        if sat2 < 15 and warmth2 < 10:
+            # Add significant penalty for matching skin tones to gray blocks
+            gray_penalty = 70.0
+        else:
+            gray_penalty = 0.0
+    else:
+        gray_penalty = 0.0
+    
+    return distance + warmth_penalty + saturation_penalty + gray_penalty
+
+
+if njit is not None:
+    # One explicit float64 signature compiles (or loads from numba's cache)
+    # at import, and lets ints and NumPy scalars of any width share it
+    # instead of compiling a specialization for each argument type
+    _color_distance_kernel = njit(
+        'float64(float64, float64, float64, float64, float64, float64)', cache=True
+    )(_color_distance_kernel)
+
 
 class ColorMatcher:
     """Finds the closest matching block for a given pixel color."""
@@ -36,24 +126,64 @@ class ColorMatcher:
         # Extract RGB components (ignore alpha)
         pixel_rgb = pixel_color[:3]
         
-        # Get all blocks with their average colors
-        all_blocks = self.block_palette.get_all_blocks()
+        block_names = self.block_palette.block_names
+        if not block_names:
+            return None
         
-        # Find the block with minimum distance
-        min_distance = float('inf')
-        closest_block = None
+        # Distances to every block at once; argmin picks the first block
+        # with the minimum distance, like a scan in palette order would
+        distances = self.color_distance_ciede2000_batch(
+            pixel_rgb, block_terms=self.block_palette.distance_terms
+        )
+        return block_names[int(np.argmin(distances))]
+    
+    def find_closest_blocks(self, colors) -> np.ndarray:
+        """
+        Find the closest block for many opaque colors at once.
+        Vectorized equivalent of find_closest_block.
         
-        for block_name, block_color in all_blocks:
-            distance = self.color_distance_ciede2000(pixel_rgb, block_color)
-            if distance < min_distance:
-                min_distance = distance
-                closest_block = block_name
-                
-                # Early exit if we found a perfect match
-                if distance == 0:
-                    return closest_block
+        Args:
+            colors: Sequence or array of K RGB colors, shape (K, 3)
+            
+        Returns:
+            Array of shape (K,) with, for each color, the index of the closest
+            block in block_palette.block_names (-1 if the palette is empty)
+        """
+        colors = np.asarray(colors).reshape(-1, 3)
+        if not self.block_palette.block_names:
+            return np.full(len(colors), -1, dtype=np.intp)
+        
+        terms = self.block_palette.distance_terms
+        c1 = colors.astype(np.float64)
+        rgb2 = terms['rgb']
+        
+        # Squared plain RGB distance to every block; exact, the values are integers
+        squared = (
+            (c1 * c1).sum(axis=1)[:, None] + (rgb2 * rgb2).sum(axis=1)[None, :]
+            - 2 * (c1 @ rgb2.T)
+        )
+        
+        # The full distance to the block nearest in plain RGB bounds the best
+        # distance from above, and since the channel weights are all >= 2 and
+        # the penalties are never negative, sqrt(2 * squared) bounds every full
+        # distance from below. Blocks whose lower bound exceeds the upper bound
+        # cannot win, so the full distance is only computed for the rest.
+        nearest = np.argmin(squared, axis=1)
+        upper = self._distance_to_terms(
+            c1, rgb2[nearest], terms['warmth'][nearest],
+            terms['saturation'][nearest], terms['gray'][nearest]
+        )
+        # Small slack so rounding in the bound never prunes an exact tie
+        rows, cols = np.nonzero(
+            2 * squared <= (upper * upper)[:, None] * (1 + 1e-9) + 1e-9
+        )
         
-        return closest_block
+        distances = np.full(squared.shape, np.inf)
+        distances[rows, cols] = self._distance_to_terms(
+            c1[rows], rgb2[cols], terms['warmth'][cols],
+            terms['saturation'][cols], terms['gray'][cols]
+        )
+        return np.argmin(distances, axis=1)
     
     def _calculate_block_distance(self, target_color: Tuple[int, int, int], 
                                    texture: 'Image.Image') -> float:
@@ -68,29 +198,16 @@ class ColorMatcher:
         Returns:
             Distance to the block's average color
         """
-        # Calculate weighted average color
-        pixels = list(texture.getdata())
-        r_sum = 0
-        g_sum = 0
-        b_sum = 0
-        weight_sum = 0
-        
-        for pixel in pixels:
-            r, g, b, a = pixel
-            weight = a / 255.0
-            r_sum += r * weight
-            g_sum += g * weight
-            b_sum += b * weight
-            weight_sum += weight
+        # Calculate weighted average color, using alpha as the weight
+        pixels = np.asarray(texture, dtype=np.float64).reshape(-1, 4)
+        weights = pixels[:, 3] / 255.0
+        weight_sum = weights.sum()
         
         if weight_sum == 0:
             return float('inf')
         
-        avg_color = (
-            round(r_sum / weight_sum),
-            round(g_sum / weight_sum),
-            round(b_sum / weight_sum)
-        )
+        rgb_sum = (pixels[:, :3] * weights[:, None]).sum(axis=0)
+        avg_color = tuple(round(c) for c in (rgb_sum / weight_sum).tolist())
         
         return self.color_distance_ciede2000(target_color, avg_color)
     
@@ -111,67 +228,166 @@ class ColorMatcher:
         """
         r1, g1, b1 = color1
         r2, g2, b2 = color2
+        return _color_distance_kernel(r1, g1, b1, r2, g2, b2)
+    
+    @staticmethod
+    def color_distance_ciede2000_batch(color: Tuple[int, int, int], block_colors=None,
+                                       block_terms: Optional[dict] = None) -> np.ndarray:
+        """
+        Vectorized color_distance_ciede2000 from one color to many block colors.
         
-        # Calculate average red
-        r_mean = (r1 + r2) / 2
+        Args:
+            color: RGB color tuple
+            block_colors: Sequence or array of N RGB colors, shape (N, 3)
+            block_terms: Result of block_distance_terms for block_colors; when
+                given, block_colors may be omitted
+            
+        Returns:
+            Array of shape (N,) with the distance to each block color
+        """
+        return ColorMatcher.color_distance_ciede2000_matrix(
+            [color], block_colors, block_terms=block_terms
+        )[0]
+    
+    @staticmethod
+    def block_distance_terms(colors) -> dict:
+        """
+        Precompute the parts of color_distance_ciede2000 that depend only on
+        the second (block) color, so they are not recomputed for every query.
         
-        # Calculate differences
+        Args:
+            colors: Sequence or array of M RGB colors, shape (M, 3)
+            
+        Returns:
+            Dict of parallel arrays: 'rgb' (M, 3) float64 colors, 'warmth'
+            and 'saturation' (M,) float64, and 'gray' (M,) bool marking
+            gray/cool blocks that get the skin tone penalty
+        """
+        rgb = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+        warmth = (r + g) / 2 - b
+        saturation = rgb.max(axis=-1) - rgb.min(axis=-1)
+        return {
+            'rgb': rgb,
+            'warmth': warmth,
+            'saturation': saturation,
+            'gray': (saturation < 15) & (warmth < 10),
+        }
+    
+    @staticmethod
+    def color_distance_ciede2000_matrix(colors1, colors2=None,
+                                        block_terms: Optional[dict] = None) -> np.ndarray:
+        """
+        Vectorized color_distance_ciede2000 between every pair of colors.
+        Produces the same values as the scalar version, computed with NumPy
+        broadcasting instead of one Python call per pair.
+        
+        Args:
+            colors1: Sequence or array of N RGB colors, shape (N, 3)
+            colors2: Sequence or array of M RGB colors, shape (M, 3)
+            block_terms: Result of block_distance_terms for colors2; when given,
+                colors2 may be omitted and the block side is not recomputed
+            
+        Returns:
+            Array of shape (N, M) where element [i, j] is the distance
+            between colors1[i] and colors2[j]
+        """
+        if block_terms is None:
+            block_terms = ColorMatcher.block_distance_terms(colors2)
+        
+        c1 = np.asarray(colors1, dtype=np.float64).reshape(-1, 1, 3)
+        return ColorMatcher._distance_to_terms(
+            c1,
+            block_terms['rgb'].reshape(1, -1, 3),
+            block_terms['warmth'].reshape(1, -1),
+            block_terms['saturation'].reshape(1, -1),
+            block_terms['gray'].reshape(1, -1),
+        )
+    
+    @staticmethod
+    def _distance_to_terms(c1: np.ndarray, c2: np.ndarray, warmth2: np.ndarray,
+                           sat2: np.ndarray, gray_block: np.ndarray) -> np.ndarray:
+        """
+        Elementwise color_distance_ciede2000 between colors c1 and block colors
+        c2 whose block-side terms are already computed. Shared by the full
+        distance matrix and the pairwise check in find_closest_blocks so both
+        give bitwise identical values.
+        
+        Args:
+            c1: float64 array of RGB colors, shape (..., 3)
+            c2: float64 array of block RGB colors, broadcastable with c1
+            warmth2: Block warmth terms, broadcastable with c1[..., 0]
+            sat2: Block saturation terms, broadcastable with c1[..., 0]
+            gray_block: Block gray flags, broadcastable with c1[..., 0]
+            
+        Returns:
+            Array of distances with the broadcast shape of c1[..., 0] and c2[..., 0]
+        """
+        r1, g1, b1 = c1[..., 0], c1[..., 1], c1[..., 2]
+        r2, g2, b2 = c2[..., 0], c2[..., 1], c2[..., 2]
+        
+        # Weighted Euclidean distance (same weights as the scalar version)
+        r_mean = (r1 + r2) / 2
         delta_r = r1 - r2
         delta_g = g1 - g2
         delta_b = b1 - b2
-        
-        # Weighted Euclidean distance that accounts for human perception
-        # Red perception varies based on average red value
         weight_r = 2 + r_mean / 256
         weight_g = 4.0
         weight_b = 2 + (255 - r_mean) / 256
-        
-        distance = math.sqrt(
+        distance = np.sqrt(
             weight_r * delta_r * delta_r +
             weight_g * delta_g * delta_g +
             weight_b * delta_b * delta_b
         )
         
-        # Add penalty for warm vs cool color mismatch
-        # This helps distinguish beige/tan colors from gray colors
-        warmth1 = (r1 + g1) / 2 - b1  # Positive for warm colors
-        warmth2 = (r2 + g2) / 2 - b2
+        warmth1 = (r1 + g1) / 2 - b1
+        sat1 = c1.max(axis=-1) - c1.min(axis=-1)
         
-        # Calculate saturation (how colorful vs gray)
-        sat1 = max(r1, g1, b1) - min(r1, g1, b1)
-        sat2 = max(r2, g2, b2) - min(r2, g2, b2)
+        # Strong penalty only for warm-to-cool or cool-to-warm mismatch
+        opposite_warmth = ((warmth1 > 5) & (warmth2 < -5)) | ((warmth1 < -5) & (warmth2 > 5))
+        warmth_diff = np.abs(warmth1 - warmth2)
+        warmth_penalty = np.where(opposite_warmth, warmth_diff * 0.8, warmth_diff * 0.2)
         
-        # Penalty for warmth mismatch - but only if signs differ (warm vs cool)
-        # Don't penalize if both are warm or both are cool, just different amounts
-        if (warmth1 > 5 and warmth2 < -5) or (warmth1 < -5 and warmth2 > 5):
-            # Strong penalty for warm-to-cool or cool-to-warm mismatch
-            warmth_penalty = abs(warmth1 - warmth2) * 0.8
-        else:
-            # Light penalty for same-category warmth differences
-            warmth_penalty = abs(warmth1 - warmth2) * 0.2
-        
-        # Penalty for saturation mismatch (colorful vs gray)
-        # Increased to better distinguish saturated skin tones from gray blocks
-        saturation_penalty = abs(sat1 - sat2) * 0.5
+        saturation_penalty = np.abs(sat1 - sat2) * 0.5
         
-        # For medium-brightness colors (likely skin tones), strongly prefer warmer blocks
-        # over gray blocks even if they're slightly further in pure RGB distance
+        # Penalize gray/cool blocks for medium-brightness saturated colors
         brightness1 = (r1 + g1 + b1) / 3
-        brightness2 = (r2 + g2 + b2) / 3
-        
-        # If source is medium brightness (50-200) with some saturation, penalize gray/cool blocks
-        if 50 < brightness1 < 200 and sat1 > 15:
-            # If target block is gray (low saturation) and cool (low warmth)
-            if sat2 < 15 and warmth2 < 10:
-                # Add significant penalty for matching skin tones to gray blocks
-                gray_penalty = 70.0
-            else:
-                gray_penalty = 0.0
-        else:
-            gray_penalty = 0.0
+        skin_tone = (50 < brightness1) & (brightness1 < 200) & (sat1 > 15)
+        gray_penalty = np.where(skin_tone & gray_block, 70.0, 0.0)
         
         return distance + warmth_penalty + saturation_penalty + gray_penalty
     
+    @staticmethod
+    def pack_colors(colors) -> np.ndarray:
+        """
+        Pack RGB colors into single integers (r << 16 | g << 8 | b), so they
+        can be hashed, compared and made unique as one value instead of three.
+        
+        Args:
+            colors: Array of RGB colors with the channels on the last axis
+            
+        Returns:
+            uint32 array with the last axis removed
+        """
+        colors = np.asarray(colors, dtype=np.uint32)
+        return (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+    
+    @staticmethod
+    def unpack_colors(keys) -> np.ndarray:
+        """
+        Inverse of pack_colors.
+        
+        Args:
+            keys: Array of packed colors
+            
+        Returns:
+            uint8 array of RGB colors with a new last axis of size 3
+        """
+        keys = np.asarray(keys, dtype=np.uint32)
+        return np.stack(
+            [(keys >> 16) & 0xFF, (keys >> 8) & 0xFF, keys & 0xFF], axis=-1
+        ).astype(np.uint8)
+    
     @staticmethod
     def color_distance(color1: Tuple[int, int, int], 
                       color2: Tuple[int, int, int]) -> float:
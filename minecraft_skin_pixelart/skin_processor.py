@@ -2,6 +2,8 @@
 SkinProcessor module for coordinating the skin conversion process.
 """
 
+from typing import BinaryIO, Union
+import numpy as np
 from PIL import Image
 from .exceptions import (
     InvalidDimensionsError,
@@ -25,12 +27,13 @@ class SkinProcessor:
         self.block_palette = block_palette
         self.color_matcher = color_matcher
     
-    def load_skin(self, skin_path: str) -> Image.Image:
+    def load_skin(self, skin_path: Union[str, BinaryIO]) -> Image.Image:
         """
         Load and validate a 64x64 skin image.
         
         Args:
-            skin_path: Path to the skin image file
+            skin_path: Path to the skin image file, or a binary file object
+                positioned at the start of the image data
             
         Returns:
             PIL Image object of the skin
@@ -50,8 +53,10 @@ class SkinProcessor:
                     )
                 
                 # Convert to RGBA for consistent processing and load into memory
-                # This creates a copy that's independent of the file
-                skin = skin.convert('RGBA')
+                # This creates a copy that's independent of the file; RGBA
+                # skins need no copy, load() below reads them into memory
+                if skin.mode != 'RGBA':
+                    skin = skin.convert('RGBA')
                 # Force load into memory to close the file
                 skin.load()
                 
@@ -77,60 +82,28 @@ class SkinProcessor:
         """
         print("      • Analyzing skin colors...", flush=True)
         
-        # Build a cache for color-to-block mapping to avoid redundant calculations
-        color_to_block_cache = {}
+        # Read all pixels at once instead of one getpixel() call per pixel
+        if skin.mode != 'RGBA':
+            skin = skin.convert('RGBA')
+        pixels = np.asarray(skin)
         
-        # Render the output image
-        print("      • Rendering output image...", flush=True)
-        output = Image.new('RGBA', (1024, 1024), (0, 0, 0, 0))
-        
-        total_pixels = 64 * 64
-        processed = 0
+        # Match every unique opaque color against the palette in one batch and
+        # map the result back to pixels (-1 marks transparent pixels). Colors
+        # are packed into single integers so np.unique sorts a flat array.
+        opaque = pixels[..., 3] >= 128
+        packed = self.color_matcher.pack_colors(pixels[opaque][:, :3])
+        unique_colors, inverse = np.unique(packed, return_inverse=True)
+        block_indices = self.color_matcher.find_closest_blocks(
+            self.color_matcher.unpack_colors(unique_colors)
+        )
+        block_map = np.full(opaque.shape, -1, dtype=np.intp)
+        block_map[opaque] = block_indices[inverse.reshape(-1)]
         
-        # Iterate over each pixel in the 64x64 skin
-        for y in range(64):
-            for x in range(64):
-                # Get the pixel color at position (x, y)
-                pixel_color = skin.getpixel((x, y))
-                
-                # Skip transparent pixels
-                if len(pixel_color) >= 4 and pixel_color[3] < 128:
-                    processed += 1
-                    continue
-                
-                # Get RGB color
-                rgb = pixel_color[:3]
-                
-                # Check cache first
-                if rgb not in color_to_block_cache:
-                    # Find the best matching block for this color
-                    block_name = self.color_matcher.find_closest_block(pixel_color)
-                    color_to_block_cache[rgb] = block_name
-                else:
-                    block_name = color_to_block_cache[rgb]
-                
-                if block_name is None:
-                    processed += 1
-                    continue
-                
-                # Get the block texture
-                block_texture = self.block_palette.get_block_texture(block_name)
-                
-                # Calculate position in output image (x*16, y*16)
-                output_x = x * 16
-                output_y = y * 16
-                
-                # Paste the block texture at the calculated position
-                output.paste(block_texture, (output_x, output_y))
-                
-                processed += 1
-                
-                # Print progress every 512 pixels
-                if processed % 512 == 0:
-                    progress = (processed / total_pixels) * 100
-                    print(f"      • Progress: {progress:.1f}% ({processed}/{total_pixels} pixels)", flush=True)
+        # Render the output image, pasting all block textures in one step
+        print("      • Rendering output image...", flush=True)
+        output = self.block_palette.render_blocks(block_map)
         
-        print(f"      • Used {len(color_to_block_cache)} unique colors", flush=True)
+        print(f"      • Used {len(unique_colors)} unique colors", flush=True)
         
         return output
 
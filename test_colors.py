@@ -1,9 +1,19 @@
 from PIL import Image
+import numpy as np
 import os
 
-# Test skin color
-skin = Image.open('your_skin.png').convert('RGBA')
-pixels = [p for p in skin.getdata() if len(p) >= 4 and p[3] > 128]
+
+def average_color(img):
+    """Alpha-weighted average RGB of an RGBA image, or None if fully transparent."""
+    pixels = np.asarray(img, dtype=np.float64).reshape(-1, 4)
+    weights = pixels[:, 3] / 255.0
+    weight_sum = weights.sum()
+    if weight_sum == 0:
+        return None
+    rgb_sum = (pixels[:, :3] * weights[:, None]).sum(axis=0)
+    return tuple(round(c) for c in (rgb_sum / weight_sum).tolist())
+
+
 test_color = (199, 184, 174)  # Typical beige skin color
 
 print(f"Test skin color: RGB{test_color}")
@@ -19,16 +29,8 @@ for block in gray_blocks:
     if os.path.exists(path):
         img = Image.open(path).convert('RGBA')
         # Calculate average color
-        pixels = list(img.getdata())
-        r_sum = g_sum = b_sum = weight_sum = 0
-        for r, g, b, a in pixels:
-            weight = a / 255.0
-            r_sum += r * weight
-            g_sum += g * weight
-            b_sum += b * weight
-            weight_sum += weight
-        if weight_sum > 0:
-            avg = (round(r_sum/weight_sum), round(g_sum/weight_sum), round(b_sum/weight_sum))
+        avg = average_color(img)
+        if avg is not None:
             warmth = (avg[0] + avg[1]) / 2 - avg[2]
             sat = max(avg) - min(avg)
             print(f"  {block}: RGB{avg}, warmth={warmth:.1f}, sat={sat}")
@@ -42,16 +44,8 @@ for block in beige_blocks:
     path = os.path.join('block', block)
     if os.path.exists(path):
         img = Image.open(path).convert('RGBA')
-        pixels = list(img.getdata())
-        r_sum = g_sum = b_sum = weight_sum = 0
-        for r, g, b, a in pixels:
-            weight = a / 255.0
-            r_sum += r * weight
-            g_sum += g * weight
-            b_sum += b * weight
-            weight_sum += weight
-        if weight_sum > 0:
-            avg = (round(r_sum/weight_sum), round(g_sum/weight_sum), round(b_sum/weight_sum))
+        avg = average_color(img)
+        if avg is not None:
             warmth = (avg[0] + avg[1]) / 2 - avg[2]
             sat = max(avg) - min(avg)
             print(f"  {block}: RGB{avg}, warmth={warmth:.1f}, sat={sat}")
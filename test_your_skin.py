@@ -1,3 +1,5 @@
+import numpy as np
+
 from minecraft_skin_pixelart.color_matcher import ColorMatcher
 from minecraft_skin_pixelart.block_palette import BlockPalette
 
@@ -10,6 +12,7 @@ skin_colors = [
 
 palette = BlockPalette('block')
 palette.load_blocks()
+block_names, block_colors = palette.get_all_blocks_array()
 
 print("=== TESTING YOUR SKIN COLORS ===\n")
 
@@ -20,19 +23,24 @@ for skin_color in skin_colors:
     saturation = max(r, g, b) - min(r, g, b)
     print(f"  Warmth: {warmth:.1f}, Saturation: {saturation}")
     
-    # Find all blocks and their distances
-    all_blocks = palette.get_all_blocks()
-    distances = []
-    
-    for block_name, block_color in all_blocks:
-        dist = ColorMatcher.color_distance_ciede2000(skin_color, block_color)
-        distances.append((block_name, block_color, dist))
+    # Distances to all blocks at once
+    distances = ColorMatcher.color_distance_ciede2000_batch(
+        skin_color, block_terms=palette.distance_terms
+    )
     
-    # Sort by distance
-    distances.sort(key=lambda x: x[2])
+    # Pick the 10 closest without sorting the whole array: the 10th smallest
+    # distance is found in linear time, then only blocks up to it are sorted
+    # (stable, so ties keep palette order)
+    kth = min(10, len(distances)) - 1
+    threshold = np.partition(distances, kth)[kth]
+    candidates = np.flatnonzero(distances <= threshold)
+    closest = candidates[np.argsort(distances[candidates], kind='stable')][:10]
     
     print(f"\n  Top 10 closest blocks:")
-    for i, (block_name, block_color, dist) in enumerate(distances[:10], 1):
+    for i, index in enumerate(closest, 1):
+        block_name = block_names[index]
+        block_color = tuple(block_colors[index].tolist())
+        dist = distances[index]
         br, bg, bb = block_color
         block_warmth = (br + bg) / 2 - bb
         block_sat = max(br, bg, bb) - min(br, bg, bb)
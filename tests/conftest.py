@@ -0,0 +1,27 @@
+"""
+Shared Hypothesis configuration for the test suite.
+
+Select a profile with the HYPOTHESIS_PROFILE environment variable:
+"dev" (the default) or "ci", which also derandomizes example generation
+so every run tests the same examples.
+"""
+
+import os
+from hypothesis import settings, HealthCheck
+
+
+# Property tests render whole images per example, so their run time is
+# dominated by Pillow/NumPy work rather than by data generation; per-example
+# deadlines and the speed/size health checks only add flakiness under load
+settings.register_profile(
+    "dev",
+    deadline=None,
+    suppress_health_check=[
+        HealthCheck.too_slow,
+        HealthCheck.large_base_example,
+        HealthCheck.data_too_large,
+    ],
+)
+settings.register_profile("ci", settings.get_profile("dev"), derandomize=True)
+
+settings.load_profile(os.environ.get("HYPOTHESIS_PROFILE", "dev"))
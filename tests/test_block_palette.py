@@ -7,6 +7,7 @@ import tempfile
 import pytest
 from hypothesis import given, settings
 import hypothesis.strategies as st
+import numpy as np
 from PIL import Image
 
 from minecraft_skin_pixelart.block_palette import BlockPalette
@@ -30,15 +31,11 @@ def block_texture_image(draw):
     width = draw(st.integers(min_value=1, max_value=32))
     height = draw(st.integers(min_value=1, max_value=32))
     
-    # Create image with random pixels
-    img = Image.new('RGB', (width, height))
-    pixels = []
-    for _ in range(width * height):
-        color = draw(rgb_color())
-        pixels.append(color)
-    img.putdata(pixels)
+    # Create image with random pixels from one byte string (3 bytes per pixel)
+    size = width * height * 3
+    data = draw(st.binary(min_size=size, max_size=size))
     
-    return img
+    return Image.frombytes('RGB', (width, height), data)
 
 
 @st.composite
@@ -122,7 +119,7 @@ class TestBlockPalette:
             palette.load_blocks()
             
             # Store the initial cache state
-            initial_cache = {k: v for k, v in palette.average_colors.items()}
+            initial_cache = palette.average_colors.copy()
             cache_object_id = id(palette.average_colors)
             
             # Perform multiple get_all_blocks operations (simulating color matching)
@@ -191,21 +188,120 @@ class TestBlockPalette:
         texture = palette.get_block_texture(first_block_name)
         assert isinstance(texture, Image.Image)
     
-    def test_empty_directory(self):
+    def test_get_all_blocks_array(self, tmp_path):
+        """
+        Test that the array view of the palette matches get_all_blocks().
+        
+        Requirements: 6.2
+        """
+        colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+        for i, color in enumerate(colors):
+            img = Image.new('RGB', (16, 16), color=color)
+            img.save(tmp_path / f"block_{i}.png")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        block_names, block_colors = palette.get_all_blocks_array()
+        
+        assert block_colors.shape == (len(colors), 3)
+        assert block_colors.dtype.name == 'uint8'
+        assert list(zip(block_names, map(tuple, block_colors.tolist()))) == (
+            palette.get_all_blocks()
+        )
+    
+    def test_blocks_loaded_in_sorted_order(self, tmp_path):
+        """
+        Test that the palette order follows the sorted file names, not the
+        order the directory lists them in.
+        
+        Requirements: 6.2
+        """
+        for name in ["stone", "acacia_log", "oak_planks", "dirt"]:
+            img = Image.new('RGB', (16, 16), color=(128, 128, 128))
+            img.save(tmp_path / f"{name}.png")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        assert palette.block_names == ["acacia_log", "dirt", "oak_planks", "stone"]
+        assert list(palette.blocks.keys()) == palette.block_names
+    
+    def test_get_block_texture_array(self, tmp_path):
+        """
+        Test that the stacked texture of each block matches its PIL texture
+        and that unknown blocks raise KeyError.
+        
+        Requirements: 6.2
+        """
+        for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+            img = Image.new('RGB', (16, 16), color=color)
+            img.save(tmp_path / f"block_{i}.png")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        for i, block_name in enumerate(palette.block_names):
+            assert palette.block_index[block_name] == i
+            tile = palette.get_block_texture_array(block_name)
+            expected = np.asarray(palette.get_block_texture(block_name))
+            assert (tile == expected).all()
+        
+        with pytest.raises(KeyError):
+            palette.get_block_texture_array("missing_block")
+    
+    def test_render_blocks_matches_paste(self, tmp_path):
+        """
+        Test that render_blocks produces the same image as pasting each
+        block texture at its cell, including textures smaller than a cell.
+        """
+        Image.new('RGB', (16, 16), color=(255, 0, 0)).save(tmp_path / "red.png")
+        Image.new('RGBA', (16, 16), color=(0, 255, 0, 100)).save(tmp_path / "green.png")
+        Image.new('RGB', (8, 12), color=(0, 0, 255)).save(tmp_path / "small_blue.png")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        block_map = np.array([[0, 1, -1], [2, -1, 0]])
+        output = palette.render_blocks(block_map)
+        
+        expected = Image.new('RGBA', (48, 32), (0, 0, 0, 0))
+        for (y, x), index in np.ndenumerate(block_map):
+            if index >= 0:
+                texture = palette.get_block_texture(palette.block_names[index])
+                expected.paste(texture, (x * 16, y * 16))
+        
+        assert output.mode == 'RGBA'
+        assert output.size == (48, 32)
+        assert np.array_equal(np.asarray(output), np.asarray(expected))
+    
+    def test_render_blocks_unloaded_palette(self, tmp_path):
+        """
+        Test that render_blocks returns a fully transparent image when the
+        palette has no textures loaded.
+        """
+        palette = BlockPalette(str(tmp_path))
+        
+        output = palette.render_blocks(np.full((2, 3), -1))
+        
+        assert output.mode == 'RGBA'
+        assert output.size == (48, 32)
+        assert output.getextrema() == ((0, 0), (0, 0), (0, 0), (0, 0))
+    
+    def test_empty_directory(self, tmp_path):
         """
         Test handling of empty directory (edge case).
         
         Requirements: 2.3
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            palette = BlockPalette(tmpdir)
-            
-            # Should raise BlockPaletteEmptyError
-            with pytest.raises(BlockPaletteEmptyError) as exc_info:
-                palette.load_blocks()
-            
-            assert "No block textures found" in str(exc_info.value)
-            assert tmpdir in str(exc_info.value)
+        palette = BlockPalette(str(tmp_path))
+        
+        # Should raise BlockPaletteEmptyError
+        with pytest.raises(BlockPaletteEmptyError) as exc_info:
+            palette.load_blocks()
+        
+        assert "No block textures found" in str(exc_info.value)
+        assert str(tmp_path) in str(exc_info.value)
     
     def test_nonexistent_directory(self):
         """
@@ -221,57 +317,53 @@ class TestBlockPalette:
         
         assert "not found" in str(exc_info.value)
     
-    def test_skip_invalid_files(self):
+    def test_skip_invalid_files(self, tmp_path):
         """
         Test that invalid files are skipped (edge case).
         
         Requirements: 2.4
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a valid PNG file
-            valid_img = Image.new('RGB', (16, 16), color=(255, 0, 0))
-            valid_path = os.path.join(tmpdir, "valid_block.png")
-            valid_img.save(valid_path)
-            
-            # Create an invalid file (not an image)
-            invalid_path = os.path.join(tmpdir, "invalid.png")
-            with open(invalid_path, 'w') as f:
-                f.write("This is not an image")
-            
-            # Create a non-PNG file
-            txt_path = os.path.join(tmpdir, "readme.txt")
-            with open(txt_path, 'w') as f:
-                f.write("Some text")
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            
-            # Should have loaded only the valid block
-            assert len(palette.blocks) == 1
-            assert "valid_block" in palette.blocks
-            assert "invalid" not in palette.blocks
-            assert "readme" not in palette.blocks
+        # Create a valid PNG file
+        valid_img = Image.new('RGB', (16, 16), color=(255, 0, 0))
+        valid_path = tmp_path / "valid_block.png"
+        valid_img.save(valid_path)
+        
+        # Create an invalid file (not an image)
+        invalid_path = tmp_path / "invalid.png"
+        invalid_path.write_text("This is not an image")
+        
+        # Create a non-PNG file
+        txt_path = tmp_path / "readme.txt"
+        txt_path.write_text("Some text")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        # Should have loaded only the valid block
+        assert len(palette.blocks) == 1
+        assert "valid_block" in palette.blocks
+        assert "invalid" not in palette.blocks
+        assert "readme" not in palette.blocks
     
-    def test_get_block_texture_nonexistent(self):
+    def test_get_block_texture_nonexistent(self, tmp_path):
         """
         Test getting a nonexistent block texture raises KeyError.
         
         Requirements: 2.1
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a valid PNG file
-            img = Image.new('RGB', (16, 16), color=(0, 255, 0))
-            img_path = os.path.join(tmpdir, "test_block.png")
-            img.save(img_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            
-            # Should raise KeyError for nonexistent block
-            with pytest.raises(KeyError):
-                palette.get_block_texture("nonexistent_block")
+        # Create a valid PNG file
+        img = Image.new('RGB', (16, 16), color=(0, 255, 0))
+        img_path = tmp_path / "test_block.png"
+        img.save(img_path)
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        # Should raise KeyError for nonexistent block
+        with pytest.raises(KeyError):
+            palette.get_block_texture("nonexistent_block")
     
-    def test_cache_usage_verification(self):
+    def test_cache_usage_verification(self, tmp_path):
         """
         Test that average colors are cached and not recomputed on access.
         
@@ -280,36 +372,35 @@ class TestBlockPalette:
         
         Requirements: 6.2, 6.3
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create test blocks
-            for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
-                img = Image.new('RGB', (16, 16), color=color)
-                img_path = os.path.join(tmpdir, f"block_{i}.png")
-                img.save(img_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            
-            # Store reference to the cache and make a copy of values
-            cache_reference = palette.average_colors
-            initial_colors = {k: v for k, v in palette.average_colors.items()}
-            
-            # Call get_all_blocks multiple times
-            for _ in range(10):
-                all_blocks = palette.get_all_blocks()
-                
-                # Verify the returned colors match the cached values
-                for block_name, avg_color in all_blocks:
-                    assert avg_color == initial_colors[block_name], (
-                        f"Color for {block_name} changed between calls"
-                    )
-            
-            # Verify the cache dictionary itself hasn't been modified
-            assert palette.average_colors == initial_colors, (
-                "Cache dictionary was modified"
-            )
+        # Create test blocks
+        for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+            img = Image.new('RGB', (16, 16), color=color)
+            img_path = tmp_path / f"block_{i}.png"
+            img.save(img_path)
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        
+        # Store reference to the cache and make a copy of values
+        cache_reference = palette.average_colors
+        initial_colors = palette.average_colors.copy()
+        
+        # Call get_all_blocks multiple times
+        for _ in range(10):
+            all_blocks = palette.get_all_blocks()
             
-            # Verify that the cache is the same object (not replaced)
-            assert palette.average_colors is cache_reference, (
-                "Cache dictionary was replaced with a new object"
-            )
+            # Verify the returned colors match the cached values
+            for block_name, avg_color in all_blocks:
+                assert avg_color == initial_colors[block_name], (
+                    f"Color for {block_name} changed between calls"
+                )
+        
+        # Verify the cache dictionary itself hasn't been modified
+        assert palette.average_colors == initial_colors, (
+            "Cache dictionary was modified"
+        )
+        
+        # Verify that the cache is the same object (not replaced)
+        assert palette.average_colors is cache_reference, (
+            "Cache dictionary was replaced with a new object"
+        )
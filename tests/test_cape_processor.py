@@ -14,15 +14,18 @@ from minecraft_skin_pixelart.exceptions import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def block_palette():
-    """Create a BlockPalette with test blocks."""
+    """
+    Create a BlockPalette with test blocks, loaded once for the module.
+    Tests must treat it as read-only.
+    """
     palette = BlockPalette("block")
     palette.load_blocks()
     return palette
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def color_matcher(block_palette):
     """Create a ColorMatcher with test palette."""
     return ColorMatcher(block_palette)
@@ -100,10 +103,8 @@ class TestProcessCape:
     def test_process_cape_with_transparency(self, cape_processor):
         """Test processing cape with transparent pixels."""
         cape = Image.new('RGBA', (64, 32), (0, 0, 0, 0))
-        # Add some opaque pixels
-        for x in range(10):
-            for y in range(10):
-                cape.putpixel((x, y), (255, 0, 0, 255))
+        # Add some opaque pixels (fill the 10x10 box in one call)
+        cape.paste((255, 0, 0, 255), (0, 0, 10, 10))
         
         output = cape_processor.process_cape(cape)
         assert output.size == (1024, 512)
@@ -112,9 +113,7 @@ class TestProcessCape:
         """Test processing cape with multiple colors."""
         cape = Image.new('RGBA', (64, 32), (255, 0, 0, 255))
         # Add different colored regions
-        for x in range(20, 40):
-            for y in range(10, 20):
-                cape.putpixel((x, y), (0, 255, 0, 255))
+        cape.paste((0, 255, 0, 255), (20, 10, 40, 20))
         
         output = cape_processor.process_cape(cape)
         assert output.size == (1024, 512)
@@ -170,8 +169,8 @@ class TestConvertCape:
         
         # Verify output
         assert output_path.exists()
-        output = Image.open(output_path)
-        assert output.size == (1024, 512)
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 512)
     
     def test_convert_cape_invalid_dimensions(self, cape_processor, tmp_path):
         """Test conversion with invalid dimensions."""
@@ -139,23 +139,98 @@ class TestColorMatcher:
         distance = ColorMatcher.color_distance(color1, color2)
         assert abs(distance - expected) < 0.01, f"Expected {expected}, got {distance}"
     
-    def test_equal_distances_first_block_selected(self):
+    @settings(max_examples=50)
+    @given(st.lists(rgb_color(), min_size=1, max_size=5),
+           st.lists(rgb_color(), min_size=1, max_size=5))
+    def test_property_distance_matrix_matches_scalar(self, colors1, colors2):
+        """
+        Test that the vectorized distance matrix and batch, with and without
+        precomputed block terms, give exactly the scalar color_distance_ciede2000
+        values.
+        """
+        matrix = ColorMatcher.color_distance_ciede2000_matrix(colors1, colors2)
+        cached = ColorMatcher.color_distance_ciede2000_matrix(
+            colors1, block_terms=ColorMatcher.block_distance_terms(colors2)
+        )
+        batch = ColorMatcher.color_distance_ciede2000_batch(colors1[0], colors2)
+        
+        assert matrix.shape == (len(colors1), len(colors2))
+        assert (batch == matrix[0]).all()
+        for i, color1 in enumerate(colors1):
+            for j, color2 in enumerate(colors2):
+                expected = ColorMatcher.color_distance_ciede2000(color1, color2)
+                assert matrix[i, j] == expected
+                assert cached[i, j] == expected
+    
+    def test_equal_distances_first_block_selected(self, tmp_path):
         """
         Test that when multiple blocks have equal distances, the first one is selected.
         
         Requirements: 3.3
         """
+        # Create blocks with colors equidistant from a test pixel
+        # Test pixel: (128, 128, 128) - middle gray
+        # Create blocks at equal distance
+        test_colors = [
+            (138, 128, 128),  # Distance = 10 in R
+            (128, 138, 128),  # Distance = 10 in G
+            (128, 128, 138),  # Distance = 10 in B
+        ]
+        
+        for i, color in enumerate(test_colors):
+            img = Image.new('RGB', (16, 16), color=color)
+            img.save(tmp_path / f"block_{i}.png")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        
+        # Test with the middle gray pixel
+        pixel_color = (128, 128, 128, 255)
+        closest_block = matcher.find_closest_block(pixel_color)
+        
+        # Verify a block was selected
+        assert closest_block is not None
+        
+        # Verify all blocks have the same distance
+        pixel_rgb = pixel_color[:3]
+        distances = []
+        for block_name, block_color in palette.get_all_blocks():
+            distance = ColorMatcher.color_distance(pixel_rgb, block_color)
+            distances.append(distance)
+        
+        # All distances should be equal (within floating point tolerance)
+        assert all(abs(d - distances[0]) < 0.01 for d in distances), (
+            f"Expected equal distances, got {distances}"
+        )
+        
+        # The selected block should be one of the blocks (first found)
+        assert closest_block in palette.blocks
+    
+    @settings(max_examples=50)
+    @given(st.lists(rgb_color(), min_size=1, max_size=20))
+    def test_property_pack_colors_round_trip(self, colors):
+        """
+        Test that packed colors unpack to the original colors and keep
+        the (r, g, b) ordering.
+        """
+        packed = ColorMatcher.pack_colors(colors)
+        
+        assert ColorMatcher.unpack_colors(packed).tolist() == [list(c) for c in colors]
+        assert sorted(range(len(colors)), key=lambda i: packed[i]) == (
+            sorted(range(len(colors)), key=lambda i: colors[i])
+        )
+    
+    @settings(max_examples=20)
+    @given(st.lists(rgb_color(), min_size=1, max_size=20))
+    def test_property_batch_matches_single_lookup(self, colors):
+        """
+        Test that find_closest_blocks picks the same block for every color
+        as find_closest_block does one color at a time.
+        """
         with tempfile.TemporaryDirectory() as tmpdir:
-            # Create blocks with colors equidistant from a test pixel
-            # Test pixel: (128, 128, 128) - middle gray
-            # Create blocks at equal distance
-            test_colors = [
-                (138, 128, 128),  # Distance = 10 in R
-                (128, 138, 128),  # Distance = 10 in G
-                (128, 128, 138),  # Distance = 10 in B
-            ]
-            
-            for i, color in enumerate(test_colors):
+            for i, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255),
+                                       (128, 128, 128), (200, 150, 120)]):
                 img = Image.new('RGB', (16, 16), color=color)
                 img.save(os.path.join(tmpdir, f"block_{i}.png"))
             
@@ -163,60 +238,43 @@ class TestColorMatcher:
             palette.load_blocks()
             matcher = ColorMatcher(palette)
             
-            # Test with the middle gray pixel
-            pixel_color = (128, 128, 128, 255)
-            closest_block = matcher.find_closest_block(pixel_color)
-            
-            # Verify a block was selected
-            assert closest_block is not None
+            indices = matcher.find_closest_blocks(colors)
             
-            # Verify all blocks have the same distance
-            pixel_rgb = pixel_color[:3]
-            distances = []
-            for block_name, block_color in palette.get_all_blocks():
-                distance = ColorMatcher.color_distance(pixel_rgb, block_color)
-                distances.append(distance)
-            
-            # All distances should be equal (within floating point tolerance)
-            assert all(abs(d - distances[0]) < 0.01 for d in distances), (
-                f"Expected equal distances, got {distances}"
-            )
-            
-            # The selected block should be one of the blocks (first found)
-            assert closest_block in palette.blocks
+            assert len(indices) == len(colors)
+            for color, index in zip(colors, indices):
+                assert palette.block_names[index] == matcher.find_closest_block(color + (255,))
     
-    def test_transparent_pixel_handling(self):
+    def test_transparent_pixel_handling(self, tmp_path):
         """
         Test handling of transparent pixels (edge case).
         
         Requirements: 3.4
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a test block
-            img = Image.new('RGB', (16, 16), color=(255, 0, 0))
-            img.save(os.path.join(tmpdir, "red_block.png"))
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            
-            # Test fully transparent pixel (alpha = 0)
-            transparent_pixel = (100, 150, 200, 0)
-            result = matcher.find_closest_block(transparent_pixel)
-            assert result is None, "Fully transparent pixel should return None"
-            
-            # Test semi-transparent pixel below threshold (alpha = 127)
-            semi_transparent = (100, 150, 200, 127)
-            result = matcher.find_closest_block(semi_transparent)
-            assert result is None, "Semi-transparent pixel (alpha < 128) should return None"
-            
-            # Test semi-transparent pixel at threshold (alpha = 128)
-            at_threshold = (100, 150, 200, 128)
-            result = matcher.find_closest_block(at_threshold)
-            assert result is not None, "Pixel with alpha >= 128 should return a block"
-            
-            # Test opaque pixel (alpha = 255)
-            opaque_pixel = (100, 150, 200, 255)
-            result = matcher.find_closest_block(opaque_pixel)
-            assert result is not None, "Opaque pixel should return a block"
-            assert result == "red_block", "Should return the only available block"
+        # Create a test block
+        img = Image.new('RGB', (16, 16), color=(255, 0, 0))
+        img.save(tmp_path / "red_block.png")
+        
+        palette = BlockPalette(str(tmp_path))
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        
+        # Test fully transparent pixel (alpha = 0)
+        transparent_pixel = (100, 150, 200, 0)
+        result = matcher.find_closest_block(transparent_pixel)
+        assert result is None, "Fully transparent pixel should return None"
+        
+        # Test semi-transparent pixel below threshold (alpha = 127)
+        semi_transparent = (100, 150, 200, 127)
+        result = matcher.find_closest_block(semi_transparent)
+        assert result is None, "Semi-transparent pixel (alpha < 128) should return None"
+        
+        # Test semi-transparent pixel at threshold (alpha = 128)
+        at_threshold = (100, 150, 200, 128)
+        result = matcher.find_closest_block(at_threshold)
+        assert result is not None, "Pixel with alpha >= 128 should return a block"
+        
+        # Test opaque pixel (alpha = 255)
+        opaque_pixel = (100, 150, 200, 255)
+        result = matcher.find_closest_block(opaque_pixel)
+        assert result is not None, "Opaque pixel should return a block"
+        assert result == "red_block", "Should return the only available block"
@@ -4,365 +4,323 @@ Integration tests for the complete Minecraft Skin Pixelart pipeline.
 
 import os
 import sys
-import tempfile
 import subprocess
 import pytest
+import numpy as np
 from PIL import Image
 
 from minecraft_skin_pixelart.skin_processor import SkinProcessor
 from minecraft_skin_pixelart.block_palette import BlockPalette
 from minecraft_skin_pixelart.color_matcher import ColorMatcher
+from minecraft_skin_pixelart.__main__ import main
+
+
+# Flat-color block textures shared by every test palette
+TEST_BLOCKS = [
+    ('red', (255, 0, 0)),
+    ('green', (0, 255, 0)),
+    ('blue', (0, 0, 255)),
+    ('white', (255, 255, 255)),
+    ('black', (0, 0, 0)),
+    ('gray', (128, 128, 128)),
+]
+
+
+def quadrant_pixels(height, width):
+    """Create RGBA pixels with red, green, blue and white quadrants."""
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    half_h, half_w = height // 2, width // 2
+    pixels[:half_h, :half_w] = (255, 0, 0, 255)      # Top-left: red
+    pixels[:half_h, half_w:] = (0, 255, 0, 255)      # Top-right: green
+    pixels[half_h:, :half_w] = (0, 0, 255, 255)      # Bottom-left: blue
+    pixels[half_h:, half_w:] = (255, 255, 255, 255)  # Bottom-right: white
+    pixels.setflags(write=False)
+    return pixels
+
+
+def half_transparent_pixels(height, width):
+    """Create RGBA pixels with an opaque red left half and a transparent right half."""
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[:, :width // 2] = (255, 0, 0, 255)
+    pixels.setflags(write=False)
+    return pixels
+
+
+# Input images shared by the pipeline tests, built once (read-only)
+QUADRANT_SKIN = quadrant_pixels(64, 64)
+QUADRANT_CAPE = quadrant_pixels(32, 64)
+HALF_TRANSPARENT_SKIN = half_transparent_pixels(64, 64)
+HALF_TRANSPARENT_CAPE = half_transparent_pixels(32, 64)
+
+
+@pytest.fixture(scope="session")
+def shared_blocks_dir(tmp_path_factory):
+    """Create one blocks directory with the TEST_BLOCKS textures for all tests."""
+    blocks_dir = tmp_path_factory.mktemp('blocks')
+    for block_name, color in TEST_BLOCKS:
+        block_img = Image.new('RGB', (16, 16), color=color)
+        block_img.save(blocks_dir / f"{block_name}.png")
+    return str(blocks_dir)
+
+
+def run_cli(monkeypatch, capsys, args):
+    """
+    Run the CLI in this process instead of spawning a new interpreter.
+    
+    Returns:
+        subprocess.CompletedProcess with the exit code and captured output
+    """
+    monkeypatch.setattr(sys, 'argv', ['minecraft_skin_pixelart'] + args)
+    try:
+        returncode = main()
+    except SystemExit as e:
+        # Some early errors exit directly instead of returning a code
+        returncode = e.code
+    captured = capsys.readouterr()
+    return subprocess.CompletedProcess(args, returncode, captured.out, captured.err)
 
 
 class TestFullPipeline:
     """Test the complete conversion pipeline from input to output."""
     
-    def test_convert_skin_full_pipeline(self):
+    def test_convert_skin_full_pipeline(self, tmp_path, shared_blocks_dir):
         """
         Test the complete pipeline from input file to output file.
         
         Requirements: All
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            test_blocks = [
-                ('red', (255, 0, 0)),
-                ('green', (0, 255, 0)),
-                ('blue', (0, 0, 255)),
-                ('white', (255, 255, 255)),
-                ('black', (0, 0, 0)),
-            ]
-            
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            for block_name, color in test_blocks:
-                block_img = Image.new('RGB', (16, 16), color=color)
-                block_path = os.path.join(blocks_dir, f"{block_name}.png")
-                block_img.save(block_path)
-            
-            # Create a test 64x64 skin with different colored quadrants
-            skin = Image.new('RGBA', (64, 64))
-            pixels = []
-            for y in range(64):
-                for x in range(64):
-                    if x < 32 and y < 32:
-                        # Top-left: red
-                        pixels.append((255, 0, 0, 255))
-                    elif x >= 32 and y < 32:
-                        # Top-right: green
-                        pixels.append((0, 255, 0, 255))
-                    elif x < 32 and y >= 32:
-                        # Bottom-left: blue
-                        pixels.append((0, 0, 255, 255))
-                    else:
-                        # Bottom-right: white
-                        pixels.append((255, 255, 255, 255))
+        # Create a test 64x64 skin with different colored quadrants
+        skin = Image.fromarray(QUADRANT_SKIN)
+        skin_path = str(tmp_path / 'test_skin.png')
+        skin.save(skin_path)
+        
+        # Initialize components
+        palette = BlockPalette(shared_blocks_dir)
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        processor = SkinProcessor(palette, matcher)
+        
+        # Run the full conversion
+        output_path = str(tmp_path / 'output.png')
+        processor.convert_skin(skin_path, output_path)
+        
+        # Verify output file was created
+        assert os.path.exists(output_path), "Output file should be created"
+        
+        # Verify output is valid and has correct dimensions
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 1024), "Output should be 1024x1024"
+            assert output.format == 'PNG', "Output should be PNG format"
             
-            skin.putdata(pixels)
-            skin_path = os.path.join(tmpdir, 'test_skin.png')
-            skin.save(skin_path)
+            # Verify the output contains block textures
+            # Check every pixel of each quadrant (block textures are flat)
+            pixels = np.asarray(output)
             
-            # Initialize components
-            palette = BlockPalette(blocks_dir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
+            # Top-left should be all red blocks
+            assert (pixels[:512, :512, :3] == (255, 0, 0)).all(), "Top-left should be red"
             
-            # Run the full conversion
-            output_path = os.path.join(tmpdir, 'output.png')
-            processor.convert_skin(skin_path, output_path)
+            # Top-right should be all green blocks
+            assert (pixels[:512, 512:, :3] == (0, 255, 0)).all(), "Top-right should be green"
             
-            # Verify output file was created
-            assert os.path.exists(output_path), "Output file should be created"
+            # Bottom-left should be all blue blocks
+            assert (pixels[512:, :512, :3] == (0, 0, 255)).all(), "Bottom-left should be blue"
             
-            # Verify output is valid and has correct dimensions
-            with Image.open(output_path) as output:
-                assert output.size == (1024, 1024), "Output should be 1024x1024"
-                assert output.format == 'PNG', "Output should be PNG format"
-                
-                # Verify the output contains block textures
-                # Check a sample pixel from each quadrant
-                
-                # Top-left should be red block (at position 8*16, 8*16)
-                sample_pixel = output.getpixel((8 * 16, 8 * 16))
-                assert sample_pixel[:3] == (255, 0, 0), "Top-left should be red"
-                
-                # Top-right should be green block (at position 40*16, 8*16)
-                sample_pixel = output.getpixel((40 * 16, 8 * 16))
-                assert sample_pixel[:3] == (0, 255, 0), "Top-right should be green"
-                
-                # Bottom-left should be blue block (at position 8*16, 40*16)
-                sample_pixel = output.getpixel((8 * 16, 40 * 16))
-                assert sample_pixel[:3] == (0, 0, 255), "Bottom-left should be blue"
-                
-                # Bottom-right should be white block (at position 40*16, 40*16)
-                sample_pixel = output.getpixel((40 * 16, 40 * 16))
-                assert sample_pixel[:3] == (255, 255, 255), "Bottom-right should be white"
+            # Bottom-right should be all white blocks
+            assert (pixels[512:, 512:, :3] == (255, 255, 255)).all(), (
+                "Bottom-right should be white"
+            )
     
-    def test_convert_skin_with_default_output(self):
+    def test_convert_skin_with_default_output(self, tmp_path, shared_blocks_dir,
+                                              monkeypatch):
         """
         Test conversion using default output path.
         
         Requirements: 5.3
         """
-        # Save current directory
-        original_dir = os.getcwd()
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            try:
-                # Change to temp directory
-                os.chdir(tmpdir)
-                
-                # Create a simple block palette
-                blocks_dir = os.path.join(tmpdir, 'blocks')
-                os.makedirs(blocks_dir)
-                
-                block_img = Image.new('RGB', (16, 16), color=(128, 128, 128))
-                block_path = os.path.join(blocks_dir, "gray.png")
-                block_img.save(block_path)
-                
-                # Create a test skin
-                skin = Image.new('RGBA', (64, 64), color=(100, 100, 100, 255))
-                skin_path = os.path.join(tmpdir, 'test_skin.png')
-                skin.save(skin_path)
-                
-                # Initialize components
-                palette = BlockPalette(blocks_dir)
-                palette.load_blocks()
-                matcher = ColorMatcher(palette)
-                processor = SkinProcessor(palette, matcher)
-                
-                # Run conversion with default output (None)
-                processor.convert_skin(skin_path, None)
-                
-                # Verify default output file was created
-                default_output = "minecraft_skin_output.png"
-                assert os.path.exists(default_output), "Default output file should be created"
-                
-                # Verify it's valid
-                with Image.open(default_output) as output:
-                    assert output.size == (1024, 1024)
-                    assert output.format == 'PNG'
-                
-                # Clean up
-                os.unlink(default_output)
-                
-            finally:
-                # Restore original directory
-                os.chdir(original_dir)
+        # Change to temp directory (restored automatically after the test)
+        monkeypatch.chdir(tmp_path)
+        
+        # Create a test skin
+        skin = Image.new('RGBA', (64, 64), color=(100, 100, 100, 255))
+        skin_path = str(tmp_path / 'test_skin.png')
+        skin.save(skin_path)
+        
+        # Initialize components
+        palette = BlockPalette(shared_blocks_dir)
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        processor = SkinProcessor(palette, matcher)
+        
+        # Run conversion with default output (None)
+        processor.convert_skin(skin_path, None)
+        
+        # Verify default output file was created
+        default_output = "minecraft_skin_output.png"
+        assert os.path.exists(default_output), "Default output file should be created"
+        
+        # Verify it's valid
+        with Image.open(default_output) as output:
+            assert output.size == (1024, 1024)
+            assert output.format == 'PNG'
     
-    def test_convert_skin_with_transparent_pixels(self):
+    def test_convert_skin_with_transparent_pixels(self, tmp_path, shared_blocks_dir):
         """
         Test conversion with transparent pixels in the skin.
         
         Requirements: 3.4
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(255, 0, 0))
-            block_path = os.path.join(blocks_dir, "red.png")
-            block_img.save(block_path)
-            
-            # Create a skin with some transparent pixels
-            skin = Image.new('RGBA', (64, 64))
-            pixels = []
-            for y in range(64):
-                for x in range(64):
-                    if x < 32:
-                        # Left half: opaque red
-                        pixels.append((255, 0, 0, 255))
-                    else:
-                        # Right half: transparent
-                        pixels.append((0, 0, 0, 0))
-            
-            skin.putdata(pixels)
-            skin_path = os.path.join(tmpdir, 'test_skin.png')
-            skin.save(skin_path)
-            
-            # Initialize components
-            palette = BlockPalette(blocks_dir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
+        # Create a skin with some transparent pixels
+        skin = Image.fromarray(HALF_TRANSPARENT_SKIN)
+        skin_path = str(tmp_path / 'test_skin.png')
+        skin.save(skin_path)
+        
+        # Initialize components
+        palette = BlockPalette(shared_blocks_dir)
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        processor = SkinProcessor(palette, matcher)
+        
+        # Run conversion
+        output_path = str(tmp_path / 'output.png')
+        processor.convert_skin(skin_path, output_path)
+        
+        # Verify output was created
+        assert os.path.exists(output_path)
+        
+        # Verify transparent pixels were handled (not replaced with blocks)
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 1024)
             
-            # Run conversion
-            output_path = os.path.join(tmpdir, 'output.png')
-            processor.convert_skin(skin_path, output_path)
+            pixels = np.asarray(output)
             
-            # Verify output was created
-            assert os.path.exists(output_path)
+            # Check that the whole left side has red blocks
+            assert (pixels[:, :512, :3] == (255, 0, 0)).all(), (
+                "Left side should have red blocks"
+            )
+            assert (pixels[:, :512, 3] == 255).all(), "Left side should be opaque"
             
-            # Verify transparent pixels were handled (not replaced with blocks)
-            with Image.open(output_path) as output:
-                assert output.size == (1024, 1024)
-                
-                # Check that left side has red blocks
-                sample_pixel = output.getpixel((8 * 16, 8 * 16))
-                assert sample_pixel[:3] == (255, 0, 0), "Left side should have red blocks"
-                
-                # Check that right side is transparent (alpha = 0)
-                sample_pixel = output.getpixel((40 * 16, 8 * 16))
-                assert sample_pixel[3] == 0, "Right side should be transparent"
+            # Check that the whole right side is transparent (alpha = 0)
+            assert (pixels[:, 512:, 3] == 0).all(), "Right side should be transparent"
 
 
 class TestCLI:
     """Test the CLI interface."""
     
-    def test_cli_with_input_and_output(self):
+    def test_cli_with_input_and_output(self, tmp_path, shared_blocks_dir, monkeypatch, capsys):
         """
         Test CLI with --input and --output parameters.
         
         Requirements: All
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            block_path = os.path.join(blocks_dir, "gray.png")
-            block_img.save(block_path)
-            
-            # Create a test skin
-            skin = Image.new('RGBA', (64, 64), color=(100, 100, 100, 255))
-            skin_path = os.path.join(tmpdir, 'test_skin.png')
-            skin.save(skin_path)
-            
-            # Run CLI
-            output_path = os.path.join(tmpdir, 'cli_output.png')
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'minecraft_skin_pixelart',
-                    '--input', skin_path,
-                    '--output', output_path,
-                    '--blocks-dir', blocks_dir
-                ],
-                capture_output=True,
-                text=True
-            )
-            
-            # Verify CLI succeeded
-            assert result.returncode == 0, f"CLI should succeed. stderr: {result.stderr}"
-            
-            # Verify output file was created
-            assert os.path.exists(output_path), "CLI should create output file"
-            
-            # Verify output is valid
-            with Image.open(output_path) as output:
-                assert output.size == (1024, 1024)
-                assert output.format == 'PNG'
-            
-            # Verify success message in output
-            assert "Conversion completed successfully" in result.stdout
+        # Create a test skin
+        skin = Image.new('RGBA', (64, 64), color=(100, 100, 100, 255))
+        skin_path = str(tmp_path / 'test_skin.png')
+        skin.save(skin_path)
+        
+        # Run CLI
+        output_path = str(tmp_path / 'cli_output.png')
+        result = run_cli(
+            monkeypatch, capsys,
+            [
+                '--input', skin_path,
+                '--output', output_path,
+                '--blocks-dir', shared_blocks_dir
+            ]
+        )
+        
+        # Verify CLI succeeded
+        assert result.returncode == 0, f"CLI should succeed. stderr: {result.stderr}"
+        
+        # Verify output file was created
+        assert os.path.exists(output_path), "CLI should create output file"
+        
+        # Verify output is valid
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 1024)
+            assert output.format == 'PNG'
+        
+        # Verify success message in output
+        assert "Conversion completed successfully" in result.stdout
     
-    def test_cli_with_invalid_dimensions(self):
+    def test_cli_with_invalid_dimensions(self, tmp_path, shared_blocks_dir, monkeypatch, capsys):
         """
         Test CLI with invalid skin dimensions.
         
         Requirements: 1.2
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            block_path = os.path.join(blocks_dir, "gray.png")
-            block_img.save(block_path)
-            
-            # Create an invalid skin (wrong dimensions)
-            skin = Image.new('RGBA', (32, 32), color=(100, 100, 100, 255))
-            skin_path = os.path.join(tmpdir, 'invalid_skin.png')
-            skin.save(skin_path)
-            
-            # Run CLI
-            output_path = os.path.join(tmpdir, 'output.png')
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'minecraft_skin_pixelart',
-                    '--input', skin_path,
-                    '--output', output_path,
-                    '--blocks-dir', blocks_dir
-                ],
-                capture_output=True,
-                text=True
-            )
-            
-            # Verify CLI failed with appropriate error
-            assert result.returncode == 1, "CLI should fail with invalid dimensions"
-            assert "Invalid skin dimensions" in result.stdout or "32x32" in result.stdout
-            assert "64x64" in result.stdout
+        # Create an invalid skin (wrong dimensions)
+        skin = Image.new('RGBA', (32, 32), color=(100, 100, 100, 255))
+        skin_path = str(tmp_path / 'invalid_skin.png')
+        skin.save(skin_path)
+        
+        # Run CLI
+        output_path = str(tmp_path / 'output.png')
+        result = run_cli(
+            monkeypatch, capsys,
+            [
+                '--input', skin_path,
+                '--output', output_path,
+                '--blocks-dir', shared_blocks_dir
+            ]
+        )
+        
+        # Verify CLI failed with appropriate error
+        assert result.returncode == 1, "CLI should fail with invalid dimensions"
+        assert "Invalid skin dimensions" in result.stdout or "32x32" in result.stdout
+        assert "64x64" in result.stdout
     
-    def test_cli_with_missing_input(self):
+    def test_cli_with_missing_input(self, tmp_path, shared_blocks_dir, monkeypatch, capsys):
         """
         Test CLI with missing input file.
         
         Requirements: 1.4
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            block_path = os.path.join(blocks_dir, "gray.png")
-            block_img.save(block_path)
-            
-            # Use a nonexistent input file
-            skin_path = os.path.join(tmpdir, 'nonexistent.png')
-            output_path = os.path.join(tmpdir, 'output.png')
-            
-            # Run CLI
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'minecraft_skin_pixelart',
-                    '--input', skin_path,
-                    '--output', output_path,
-                    '--blocks-dir', blocks_dir
-                ],
-                capture_output=True,
-                text=True
-            )
-            
-            # Verify CLI failed
-            assert result.returncode == 1, "CLI should fail with missing input"
-            assert "not found" in result.stdout.lower()
+        # Use a nonexistent input file
+        skin_path = str(tmp_path / 'nonexistent.png')
+        output_path = str(tmp_path / 'output.png')
+        
+        # Run CLI
+        result = run_cli(
+            monkeypatch, capsys,
+            [
+                '--input', skin_path,
+                '--output', output_path,
+                '--blocks-dir', shared_blocks_dir
+            ]
+        )
+        
+        # Verify CLI failed
+        assert result.returncode == 1, "CLI should fail with missing input"
+        assert "not found" in result.stdout.lower()
     
-    def test_cli_with_missing_blocks_directory(self):
+    def test_cli_with_missing_blocks_directory(self, tmp_path, monkeypatch, capsys):
         """
         Test CLI with missing blocks directory.
         
         Requirements: 2.3
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a test skin
-            skin = Image.new('RGBA', (64, 64), color=(100, 100, 100, 255))
-            skin_path = os.path.join(tmpdir, 'test_skin.png')
-            skin.save(skin_path)
-            
-            # Use a nonexistent blocks directory
-            blocks_dir = os.path.join(tmpdir, 'nonexistent_blocks')
-            output_path = os.path.join(tmpdir, 'output.png')
-            
-            # Run CLI
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'minecraft_skin_pixelart',
-                    '--input', skin_path,
-                    '--output', output_path,
-                    '--blocks-dir', blocks_dir
-                ],
-                capture_output=True,
-                text=True
-            )
-            
-            # Verify CLI failed
-            assert result.returncode == 1, "CLI should fail with missing blocks directory"
-            assert "not found" in result.stdout.lower()
+        # Create a test skin
+        skin = Image.new('RGBA', (64, 64), color=(100, 100, 100, 255))
+        skin_path = str(tmp_path / 'test_skin.png')
+        skin.save(skin_path)
+        
+        # Use a nonexistent blocks directory
+        blocks_dir = str(tmp_path / 'nonexistent_blocks')
+        output_path = str(tmp_path / 'output.png')
+        
+        # Run CLI
+        result = run_cli(
+            monkeypatch, capsys,
+            [
+                '--input', skin_path,
+                '--output', output_path,
+                '--blocks-dir', blocks_dir
+            ]
+        )
+        
+        # Verify CLI failed
+        assert result.returncode == 1, "CLI should fail with missing blocks directory"
+        assert "not found" in result.stdout.lower()
     
     def test_cli_help_message(self):
         """
@@ -385,230 +343,156 @@ class TestCLI:
 class TestCapePipeline:
     """Test the complete conversion pipeline for capes."""
     
-    def test_convert_cape_full_pipeline(self):
+    def test_convert_cape_full_pipeline(self, tmp_path, shared_blocks_dir):
         """
         Test the complete pipeline from input cape file to output file.
         """
         from minecraft_skin_pixelart.cape_processor import CapeProcessor
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            test_blocks = [
-                ('red', (255, 0, 0)),
-                ('green', (0, 255, 0)),
-                ('blue', (0, 0, 255)),
-                ('white', (255, 255, 255)),
-            ]
-            
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            for block_name, color in test_blocks:
-                block_img = Image.new('RGB', (16, 16), color=color)
-                block_path = os.path.join(blocks_dir, f"{block_name}.png")
-                block_img.save(block_path)
-            
-            # Create a test 64x32 cape with different colored quadrants
-            cape = Image.new('RGBA', (64, 32))
-            pixels = []
-            for y in range(32):
-                for x in range(64):
-                    if x < 32 and y < 16:
-                        # Top-left: red
-                        pixels.append((255, 0, 0, 255))
-                    elif x >= 32 and y < 16:
-                        # Top-right: green
-                        pixels.append((0, 255, 0, 255))
-                    elif x < 32 and y >= 16:
-                        # Bottom-left: blue
-                        pixels.append((0, 0, 255, 255))
-                    else:
-                        # Bottom-right: white
-                        pixels.append((255, 255, 255, 255))
+        # Create a test 64x32 cape with different colored quadrants
+        cape = Image.fromarray(QUADRANT_CAPE)
+        cape_path = str(tmp_path / 'test_cape.png')
+        cape.save(cape_path)
+        
+        # Initialize components
+        palette = BlockPalette(shared_blocks_dir)
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        processor = CapeProcessor(palette, matcher)
+        
+        # Run the full conversion
+        output_path = str(tmp_path / 'output.png')
+        processor.convert_cape(cape_path, output_path)
+        
+        # Verify output file was created
+        assert os.path.exists(output_path), "Output file should be created"
+        
+        # Verify output is valid and has correct dimensions
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 512), "Output should be 1024x512"
+            assert output.format == 'PNG', "Output should be PNG format"
             
-            cape.putdata(pixels)
-            cape_path = os.path.join(tmpdir, 'test_cape.png')
-            cape.save(cape_path)
+            # Verify the output contains block textures
+            # Check every pixel of each quadrant (block textures are flat)
+            pixels = np.asarray(output)
             
-            # Initialize components
-            palette = BlockPalette(blocks_dir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = CapeProcessor(palette, matcher)
+            # Top-left should be all red blocks
+            assert (pixels[:256, :512, :3] == (255, 0, 0)).all(), "Top-left should be red"
             
-            # Run the full conversion
-            output_path = os.path.join(tmpdir, 'output.png')
-            processor.convert_cape(cape_path, output_path)
+            # Top-right should be all green blocks
+            assert (pixels[:256, 512:, :3] == (0, 255, 0)).all(), "Top-right should be green"
             
-            # Verify output file was created
-            assert os.path.exists(output_path), "Output file should be created"
+            # Bottom-left should be all blue blocks
+            assert (pixels[256:, :512, :3] == (0, 0, 255)).all(), "Bottom-left should be blue"
             
-            # Verify output is valid and has correct dimensions
-            with Image.open(output_path) as output:
-                assert output.size == (1024, 512), "Output should be 1024x512"
-                assert output.format == 'PNG', "Output should be PNG format"
-                
-                # Verify the output contains block textures
-                # Check a sample pixel from each quadrant
-                
-                # Top-left should be red block (at position 8*16, 4*16)
-                sample_pixel = output.getpixel((8 * 16, 4 * 16))
-                assert sample_pixel[:3] == (255, 0, 0), "Top-left should be red"
-                
-                # Top-right should be green block (at position 40*16, 4*16)
-                sample_pixel = output.getpixel((40 * 16, 4 * 16))
-                assert sample_pixel[:3] == (0, 255, 0), "Top-right should be green"
-                
-                # Bottom-left should be blue block (at position 8*16, 20*16)
-                sample_pixel = output.getpixel((8 * 16, 20 * 16))
-                assert sample_pixel[:3] == (0, 0, 255), "Bottom-left should be blue"
-                
-                # Bottom-right should be white block (at position 40*16, 20*16)
-                sample_pixel = output.getpixel((40 * 16, 20 * 16))
-                assert sample_pixel[:3] == (255, 255, 255), "Bottom-right should be white"
+            # Bottom-right should be all white blocks
+            assert (pixels[256:, 512:, :3] == (255, 255, 255)).all(), (
+                "Bottom-right should be white"
+            )
     
-    def test_convert_cape_with_transparency(self):
+    def test_convert_cape_with_transparency(self, tmp_path, shared_blocks_dir):
         """
         Test conversion with transparent pixels in the cape.
         """
         from minecraft_skin_pixelart.cape_processor import CapeProcessor
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(255, 0, 0))
-            block_path = os.path.join(blocks_dir, "red.png")
-            block_img.save(block_path)
-            
-            # Create a cape with some transparent pixels
-            cape = Image.new('RGBA', (64, 32))
-            pixels = []
-            for y in range(32):
-                for x in range(64):
-                    if x < 32:
-                        # Left half: opaque red
-                        pixels.append((255, 0, 0, 255))
-                    else:
-                        # Right half: transparent
-                        pixels.append((0, 0, 0, 0))
-            
-            cape.putdata(pixels)
-            cape_path = os.path.join(tmpdir, 'test_cape.png')
-            cape.save(cape_path)
-            
-            # Initialize components
-            palette = BlockPalette(blocks_dir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = CapeProcessor(palette, matcher)
+        # Create a cape with some transparent pixels
+        cape = Image.fromarray(HALF_TRANSPARENT_CAPE)
+        cape_path = str(tmp_path / 'test_cape.png')
+        cape.save(cape_path)
+        
+        # Initialize components
+        palette = BlockPalette(shared_blocks_dir)
+        palette.load_blocks()
+        matcher = ColorMatcher(palette)
+        processor = CapeProcessor(palette, matcher)
+        
+        # Run conversion
+        output_path = str(tmp_path / 'output.png')
+        processor.convert_cape(cape_path, output_path)
+        
+        # Verify output was created
+        assert os.path.exists(output_path)
+        
+        # Verify transparent pixels were handled
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 512)
             
-            # Run conversion
-            output_path = os.path.join(tmpdir, 'output.png')
-            processor.convert_cape(cape_path, output_path)
+            pixels = np.asarray(output)
             
-            # Verify output was created
-            assert os.path.exists(output_path)
+            # Check that the whole left side has red blocks
+            assert (pixels[:, :512, :3] == (255, 0, 0)).all(), (
+                "Left side should have red blocks"
+            )
+            assert (pixels[:, :512, 3] == 255).all(), "Left side should be opaque"
             
-            # Verify transparent pixels were handled
-            with Image.open(output_path) as output:
-                assert output.size == (1024, 512)
-                
-                # Check that left side has red blocks
-                sample_pixel = output.getpixel((8 * 16, 8 * 16))
-                assert sample_pixel[:3] == (255, 0, 0), "Left side should have red blocks"
-                
-                # Check that right side is transparent (alpha = 0)
-                sample_pixel = output.getpixel((40 * 16, 8 * 16))
-                assert sample_pixel[3] == 0, "Right side should be transparent"
+            # Check that the whole right side is transparent (alpha = 0)
+            assert (pixels[:, 512:, 3] == 0).all(), "Right side should be transparent"
 
 
 class TestCapeCLI:
     """Test the CLI interface for capes."""
     
-    def test_cli_cape_with_input_and_output(self):
+    def test_cli_cape_with_input_and_output(self, tmp_path, shared_blocks_dir, monkeypatch, capsys):
         """
         Test CLI with --cape flag.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            block_path = os.path.join(blocks_dir, "gray.png")
-            block_img.save(block_path)
-            
-            # Create a test cape
-            cape = Image.new('RGBA', (64, 32), color=(100, 100, 100, 255))
-            cape_path = os.path.join(tmpdir, 'test_cape.png')
-            cape.save(cape_path)
-            
-            # Run CLI with --cape flag
-            output_path = os.path.join(tmpdir, 'cli_output.png')
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'minecraft_skin_pixelart',
-                    '--input', cape_path,
-                    '--output', output_path,
-                    '--blocks-dir', blocks_dir,
-                    '--cape'
-                ],
-                capture_output=True,
-                text=True
-            )
-            
-            # Verify CLI succeeded
-            assert result.returncode == 0, f"CLI should succeed. stderr: {result.stderr}"
-            
-            # Verify output file was created
-            assert os.path.exists(output_path), "CLI should create output file"
-            
-            # Verify output is valid
-            with Image.open(output_path) as output:
-                assert output.size == (1024, 512), "Cape output should be 1024x512"
-                assert output.format == 'PNG'
-            
-            # Verify success message in output
-            assert "Conversion completed successfully" in result.stdout
+        # Create a test cape
+        cape = Image.new('RGBA', (64, 32), color=(100, 100, 100, 255))
+        cape_path = str(tmp_path / 'test_cape.png')
+        cape.save(cape_path)
+        
+        # Run CLI with --cape flag
+        output_path = str(tmp_path / 'cli_output.png')
+        result = run_cli(
+            monkeypatch, capsys,
+            [
+                '--input', cape_path,
+                '--output', output_path,
+                '--blocks-dir', shared_blocks_dir,
+                '--cape'
+            ]
+        )
+        
+        # Verify CLI succeeded
+        assert result.returncode == 0, f"CLI should succeed. stderr: {result.stderr}"
+        
+        # Verify output file was created
+        assert os.path.exists(output_path), "CLI should create output file"
+        
+        # Verify output is valid
+        with Image.open(output_path) as output:
+            assert output.size == (1024, 512), "Cape output should be 1024x512"
+            assert output.format == 'PNG'
+        
+        # Verify success message in output
+        assert "Conversion completed successfully" in result.stdout
     
-    def test_cli_cape_with_invalid_dimensions(self):
+    def test_cli_cape_with_invalid_dimensions(self, tmp_path, shared_blocks_dir, monkeypatch, capsys):
         """
         Test CLI with invalid cape dimensions.
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette
-            blocks_dir = os.path.join(tmpdir, 'blocks')
-            os.makedirs(blocks_dir)
-            
-            block_img = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            block_path = os.path.join(blocks_dir, "gray.png")
-            block_img.save(block_path)
-            
-            # Create an invalid cape (wrong dimensions)
-            cape = Image.new('RGBA', (32, 32), color=(100, 100, 100, 255))
-            cape_path = os.path.join(tmpdir, 'invalid_cape.png')
-            cape.save(cape_path)
-            
-            # Run CLI with --cape flag
-            output_path = os.path.join(tmpdir, 'output.png')
-            result = subprocess.run(
-                [
-                    sys.executable, '-m', 'minecraft_skin_pixelart',
-                    '--input', cape_path,
-                    '--output', output_path,
-                    '--blocks-dir', blocks_dir,
-                    '--cape'
-                ],
-                capture_output=True,
-                text=True
-            )
-            
-            # Verify CLI failed with appropriate error
-            assert result.returncode == 1, "CLI should fail with invalid dimensions"
-            assert "Invalid cape dimensions" in result.stdout or "32x32" in result.stdout
-            assert "64x32" in result.stdout
+        # Create an invalid cape (wrong dimensions)
+        cape = Image.new('RGBA', (32, 32), color=(100, 100, 100, 255))
+        cape_path = str(tmp_path / 'invalid_cape.png')
+        cape.save(cape_path)
+        
+        # Run CLI with --cape flag
+        output_path = str(tmp_path / 'output.png')
+        result = run_cli(
+            monkeypatch, capsys,
+            [
+                '--input', cape_path,
+                '--output', output_path,
+                '--blocks-dir', shared_blocks_dir,
+                '--cape'
+            ]
+        )
+        
+        # Verify CLI failed with appropriate error
+        assert result.returncode == 1, "CLI should fail with invalid dimensions"
+        assert "Invalid cape dimensions" in result.stdout or "32x32" in result.stdout
+        assert "64x32" in result.stdout
     
     def test_cli_help_includes_cape_option(self):
         """
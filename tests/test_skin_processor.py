@@ -2,10 +2,12 @@
 Unit and property tests for SkinProcessor.
 """
 
+import io
 import os
 import tempfile
 import pytest
-from hypothesis import given, settings, assume, HealthCheck
+import numpy as np
+from hypothesis import given, settings, assume
 import hypothesis.strategies as st
 from PIL import Image
 
@@ -15,6 +17,50 @@ from minecraft_skin_pixelart.color_matcher import ColorMatcher
 from minecraft_skin_pixelart.exceptions import InvalidDimensionsError, InvalidImageError
 
 
+@pytest.fixture(scope="module")
+def palette_dir(tmp_path_factory):
+    """Create a palette directory with a single dummy block, once for the module."""
+    palette_dir = tmp_path_factory.mktemp('palette')
+    dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
+    dummy_block.save(palette_dir / "dummy.png")
+    return str(palette_dir)
+
+
+@pytest.fixture(scope="module")
+def processor(palette_dir):
+    """
+    Create a SkinProcessor over the dummy palette, once for the module.
+    Tests must treat it as read-only and write their files to tmp_path.
+    """
+    palette = BlockPalette(palette_dir)
+    palette.load_blocks()
+    matcher = ColorMatcher(palette)
+    return SkinProcessor(palette, matcher)
+
+
+@pytest.fixture(scope="module")
+def color_processor(tmp_path_factory):
+    """
+    Create a SkinProcessor over a palette of five flat-color blocks, once for
+    the module. Tests must treat it as read-only.
+    """
+    palette_dir = tmp_path_factory.mktemp('color_palette')
+    test_blocks = [
+        ('red', (255, 0, 0)),
+        ('green', (0, 255, 0)),
+        ('blue', (0, 0, 255)),
+        ('white', (255, 255, 255)),
+        ('black', (0, 0, 0)),
+    ]
+    for block_name, color in test_blocks:
+        Image.new('RGB', (16, 16), color=color).save(palette_dir / f"{block_name}.png")
+    
+    palette = BlockPalette(str(palette_dir))
+    palette.load_blocks()
+    matcher = ColorMatcher(palette)
+    return SkinProcessor(palette, matcher)
+
+
 # Custom Hypothesis strategies
 @st.composite
 def image_dimensions(draw):
@@ -29,9 +75,6 @@ def skin_image_with_dimensions(draw):
     """Generate a random image with specified dimensions."""
     width, height = draw(image_dimensions())
     
-    # Create image - use simpler color generation for speed
-    img = Image.new('RGBA', (width, height))
-    
     # Generate a single random color and fill the image (much faster)
     r = draw(st.integers(min_value=0, max_value=255))
     g = draw(st.integers(min_value=0, max_value=255))
@@ -39,18 +82,15 @@ def skin_image_with_dimensions(draw):
     a = draw(st.integers(min_value=0, max_value=255))
     
     # Fill with solid color for speed
-    pixels = [(r, g, b, a)] * (width * height)
-    img.putdata(pixels)
-    
-    return img
+    return Image.new('RGBA', (width, height), color=(r, g, b, a))
 
 
 class TestSkinProcessor:
     """Test suite for SkinProcessor class."""
     
-    @settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow])
+    @settings(max_examples=50)
     @given(skin_image_with_dimensions())
-    def test_property_input_validation_consistency(self, test_image):
+    def test_property_input_validation_consistency(self, processor, test_image):
         """
         Property 1: Input Validation Consistency
         
@@ -61,214 +101,131 @@ class TestSkinProcessor:
         
         Validates: Requirements 1.1, 1.2, 1.3
         """
-        # Create a minimal BlockPalette and ColorMatcher for testing
-        # We don't need actual blocks for this test
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Save test image to a temporary file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-                tmp_path = tmp_file.name
+        # Encode the test image in memory, the property is about the
+        # dimension check and needs no file on disk
+        buffer = io.BytesIO()
+        test_image.save(buffer, 'PNG')
+        buffer.seek(0)
+        width, height = test_image.size
+        
+        if width == 64 and height == 64:
+            # Should successfully load
+            loaded_skin = processor.load_skin(buffer)
+            assert loaded_skin is not None
+            assert loaded_skin.size == (64, 64)
+        else:
+            # Should raise InvalidDimensionsError
+            with pytest.raises(InvalidDimensionsError) as exc_info:
+                processor.load_skin(buffer)
             
-            try:
-                test_image.save(tmp_path, 'PNG')
-                width, height = test_image.size
-                
-                if width == 64 and height == 64:
-                    # Should successfully load
-                    loaded_skin = processor.load_skin(tmp_path)
-                    assert loaded_skin is not None
-                    assert loaded_skin.size == (64, 64)
-                    # Close the loaded image to release file handle
-                    loaded_skin.close()
-                else:
-                    # Should raise InvalidDimensionsError
-                    with pytest.raises(InvalidDimensionsError) as exc_info:
-                        processor.load_skin(tmp_path)
-                    
-                    # Verify error message contains dimension information
-                    error_msg = str(exc_info.value)
-                    assert "Invalid skin dimensions" in error_msg
-                    assert f"{width}x{height}" in error_msg
-                    assert "64x64" in error_msg
-            finally:
-                # Clean up temporary file
-                try:
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
-                except PermissionError:
-                    # On Windows, file might still be locked
-                    pass
+            # Verify error message contains dimension information
+            error_msg = str(exc_info.value)
+            assert "Invalid skin dimensions" in error_msg
+            assert f"{width}x{height}" in error_msg
+            assert "64x64" in error_msg
     
-    def test_load_valid_64x64_skin(self):
+    def test_load_valid_64x64_skin(self, processor, tmp_path):
         """
         Test loading a valid 64x64 skin.
         
         Requirements: 1.1, 1.2, 1.3
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Create a valid 64x64 skin
-            skin = Image.new('RGBA', (64, 64), color=(255, 0, 0, 255))
-            skin_path = os.path.join(tmpdir, "test_skin.png")
-            skin.save(skin_path)
-            
-            # Load the skin
-            loaded_skin = processor.load_skin(skin_path)
-            
-            # Verify it was loaded correctly
-            assert loaded_skin is not None
-            assert loaded_skin.size == (64, 64)
-            assert loaded_skin.mode == 'RGBA'
+        # Create a valid 64x64 skin
+        skin = Image.new('RGBA', (64, 64), color=(255, 0, 0, 255))
+        skin_path = str(tmp_path / "test_skin.png")
+        skin.save(skin_path)
+        
+        # Load the skin
+        loaded_skin = processor.load_skin(skin_path)
+        
+        # Verify it was loaded correctly
+        assert loaded_skin is not None
+        assert loaded_skin.size == (64, 64)
+        assert loaded_skin.mode == 'RGBA'
     
-    def test_reject_wrong_dimensions(self):
+    @pytest.mark.parametrize("width, height", [(63, 63), (65, 65), (128, 128), (64, 32), (32, 64)])
+    def test_reject_wrong_dimensions(self, processor, tmp_path, width, height):
         """
         Test rejection of skins with wrong dimensions (63x63, 65x65, 128x128).
         
         Requirements: 1.1, 1.2
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Test various wrong dimensions
-            wrong_dimensions = [(63, 63), (65, 65), (128, 128), (64, 32), (32, 64)]
-            
-            for width, height in wrong_dimensions:
-                # Create a skin with wrong dimensions
-                skin = Image.new('RGBA', (width, height), color=(0, 255, 0, 255))
-                skin_path = os.path.join(tmpdir, f"skin_{width}x{height}.png")
-                skin.save(skin_path)
-                skin.close()  # Close to release file handle
-                
-                # Should raise InvalidDimensionsError
-                try:
-                    with pytest.raises(InvalidDimensionsError) as exc_info:
-                        processor.load_skin(skin_path)
-                    
-                    # Verify error message
-                    error_msg = str(exc_info.value)
-                    assert "Invalid skin dimensions" in error_msg
-                    assert f"{width}x{height}" in error_msg
-                    assert "64x64" in error_msg
-                finally:
-                    # Clean up the file immediately
-                    try:
-                        os.unlink(skin_path)
-                    except (PermissionError, FileNotFoundError):
-                        pass
+        # Create a skin with wrong dimensions
+        skin = Image.new('RGBA', (width, height), color=(0, 255, 0, 255))
+        skin_path = str(tmp_path / f"skin_{width}x{height}.png")
+        skin.save(skin_path)
+        
+        # Should raise InvalidDimensionsError
+        with pytest.raises(InvalidDimensionsError) as exc_info:
+            processor.load_skin(skin_path)
+        
+        # Verify error message
+        error_msg = str(exc_info.value)
+        assert "Invalid skin dimensions" in error_msg
+        assert f"{width}x{height}" in error_msg
+        assert "64x64" in error_msg
     
-    def test_handle_corrupted_files(self):
+    @pytest.mark.parametrize("file_name, contents", [
+        ("corrupted.png", b"This is not an image file"),  # Not an image
+        ("nonexistent.png", None),  # Missing file
+    ])
+    def test_handle_unreadable_files(self, processor, tmp_path, file_name, contents):
         """
-        Test handling of corrupted/invalid image files (edge case).
+        Test handling of corrupted/invalid and nonexistent image files (edge case).
         
         Requirements: 1.4
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Create a corrupted file (not an image)
-            corrupted_path = os.path.join(tmpdir, "corrupted.png")
-            with open(corrupted_path, 'w') as f:
-                f.write("This is not an image file")
-            
-            # Should raise InvalidImageError
-            with pytest.raises(InvalidImageError) as exc_info:
-                processor.load_skin(corrupted_path)
-            
-            # Verify error message
-            error_msg = str(exc_info.value)
-            assert "Cannot read image file" in error_msg
-            assert corrupted_path in error_msg
-            assert "corrupted or not an image" in error_msg
+        path = tmp_path / file_name
+        if contents is not None:
+            path.write_bytes(contents)
+        
+        # Should raise InvalidImageError
+        with pytest.raises(InvalidImageError) as exc_info:
+            processor.load_skin(str(path))
+        
+        # Verify error message
+        error_msg = str(exc_info.value)
+        assert "Cannot read image file" in error_msg
+        assert str(path) in error_msg
+        assert "corrupted or not an image" in error_msg
     
-    def test_handle_nonexistent_file(self):
+    def test_process_skin_unloaded_palette(self, tmp_path):
         """
-        Test handling of nonexistent file (edge case).
-        
-        Requirements: 1.4
+        Test that processing with a palette that has no blocks loaded gives
+        a fully transparent 1024x1024 image instead of failing (edge case).
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Try to load a nonexistent file
-            nonexistent_path = os.path.join(tmpdir, "nonexistent.png")
-            
-            # Should raise InvalidImageError
-            with pytest.raises(InvalidImageError) as exc_info:
-                processor.load_skin(nonexistent_path)
-            
-            # Verify error message
-            error_msg = str(exc_info.value)
-            assert "Cannot read image file" in error_msg
-
+        palette = BlockPalette(str(tmp_path))
+        processor = SkinProcessor(palette, ColorMatcher(palette))
+        skin = Image.new('RGBA', (64, 64), color=(255, 0, 0, 255))
+        
+        output = processor.process_skin(skin)
+        
+        assert output.mode == 'RGBA'
+        assert output.size == (1024, 1024)
+        assert output.getextrema() == ((0, 0), (0, 0), (0, 0), (0, 0))
 
 
 # Custom Hypothesis strategies for process_skin tests
 @st.composite
 def valid_skin_image(draw):
     """Generate a random valid 64x64 skin image."""
-    img = Image.new('RGBA', (64, 64))
-    
-    # Generate random pixels
-    pixels = []
-    for _ in range(64 * 64):
-        r = draw(st.integers(min_value=0, max_value=255))
-        g = draw(st.integers(min_value=0, max_value=255))
-        b = draw(st.integers(min_value=0, max_value=255))
-        a = draw(st.integers(min_value=0, max_value=255))
-        pixels.append((r, g, b, a))
+    # Generate random pixels as a random index per pixel into 256 random
+    # RGBA colors; 4 bytes per pixel would exceed Hypothesis' per-example
+    # data limit
+    colors = draw(st.binary(min_size=256 * 4, max_size=256 * 4))
+    indices = draw(st.binary(min_size=64 * 64, max_size=64 * 64))
     
-    img.putdata(pixels)
-    return img
+    img = Image.frombytes('P', (64, 64), indices)
+    img.putpalette(colors, rawmode='RGBA')
+    return img.convert('RGBA')
 
 
 class TestSkinProcessing:
     """Test suite for skin processing functionality."""
     
-    @settings(max_examples=10, suppress_health_check=[HealthCheck.too_slow, HealthCheck.large_base_example, HealthCheck.data_too_large])
+    @settings(max_examples=10)
     @given(valid_skin_image())
-    def test_property_output_image_structure(self, skin):
+    def test_property_output_image_structure(self, color_processor, skin):
         """
         Property 4: Output Image Structure
         
@@ -279,83 +236,60 @@ class TestSkinProcessing:
         
         Validates: Requirements 4.1, 4.2
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a simple block palette with a few test blocks
-            test_blocks = [
-                ('red', (255, 0, 0)),
-                ('green', (0, 255, 0)),
-                ('blue', (0, 0, 255)),
-                ('white', (255, 255, 255)),
-                ('black', (0, 0, 0)),
-            ]
-            
-            for block_name, color in test_blocks:
-                block_img = Image.new('RGB', (16, 16), color=color)
-                block_path = os.path.join(tmpdir, f"{block_name}.png")
-                block_img.save(block_path)
-            
-            # Initialize components
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Process the skin
-            output = processor.process_skin(skin)
-            
-            # Property 1: Output must be exactly 1024x1024
-            assert output.size == (1024, 1024), \
-                f"Output size should be 1024x1024, got {output.size}"
-            
-            # Property 2: Each 16x16 region should contain the matched block texture
-            # We'll verify this by checking a sample of positions
-            for y in range(0, 64, 8):  # Sample every 8th pixel for performance
-                for x in range(0, 64, 8):
-                    # Get the pixel color from input
-                    pixel_color = skin.getpixel((x, y))
-                    
-                    # Find what block should be matched
-                    expected_block = matcher.find_closest_block(pixel_color)
-                    
-                    # If transparent, skip
-                    if expected_block is None:
-                        continue
-                    
-                    # Get the expected block texture
-                    expected_texture = palette.get_block_texture(expected_block)
-                    
-                    # Get the 16x16 region from output at position (x*16, y*16)
-                    output_x = x * 16
-                    output_y = y * 16
-                    output_region = output.crop((
-                        output_x, 
-                        output_y, 
-                        output_x + 16, 
-                        output_y + 16
-                    ))
-                    
-                    # Convert both to RGB for comparison (ignore alpha differences)
-                    expected_rgb = expected_texture.convert('RGB')
-                    output_rgb = output_region.convert('RGB')
-                    
-                    # Compare the textures
-                    assert output_rgb.size == (16, 16), \
-                        f"Output region should be 16x16, got {output_rgb.size}"
-                    
-                    # Verify the texture matches by comparing pixel data
-                    expected_pixels = list(expected_rgb.getdata())
-                    output_pixels = list(output_rgb.getdata())
-                    
-                    assert expected_pixels == output_pixels, \
-                        f"Block texture at ({x}, {y}) doesn't match expected block {expected_block}"
+        palette = color_processor.block_palette
+        matcher = color_processor.color_matcher
+        
+        # Process the skin
+        output = color_processor.process_skin(skin)
+        
+        # Property 1: Output must be exactly 1024x1024
+        assert output.size == (1024, 1024), \
+            f"Output size should be 1024x1024, got {output.size}"
+        
+        # Property 2: Each 16x16 region should contain the matched block texture.
+        # Checked at a sample of positions against one RGB array of the whole
+        # output (ignore alpha differences), sliced per block
+        output_rgb = np.asarray(output.convert('RGB'))
+        
+        # Expected blocks come from the scalar find_closest_block, independent of
+        # the batch matching process_skin uses; each distinct color is matched once
+        expected_blocks = {}
+        
+        for y in range(0, 64, 8):  # Sample every 8th pixel for performance
+            for x in range(0, 64, 8):
+                # Find what block should be matched
+                pixel_color = skin.getpixel((x, y))
+                if pixel_color not in expected_blocks:
+                    expected_blocks[pixel_color] = matcher.find_closest_block(pixel_color)
+                expected_block = expected_blocks[pixel_color]
+                
+                # If transparent, skip
+                if expected_block is None:
+                    continue
+                
+                # Get the expected block texture as an RGB tile
+                expected_texture = palette.get_block_texture_array(expected_block)[..., :3]
+                
+                # Get the 16x16 region from output at position (x*16, y*16)
+                output_x = x * 16
+                output_y = y * 16
+                output_region = output_rgb[output_y:output_y + 16, output_x:output_x + 16]
+                
+                # Compare the textures
+                assert output_region.shape == (16, 16, 3), \
+                    f"Output region should be 16x16, got {output_region.shape[:2]}"
+                
+                # Verify the texture matches pixel for pixel
+                assert np.array_equal(output_region, expected_texture), \
+                    f"Block texture at ({x}, {y}) doesn't match expected block {expected_block}"
 
 
 class TestSaveOutput:
     """Test suite for save_output functionality."""
     
-    @settings(max_examples=50, suppress_health_check=[HealthCheck.too_slow])
-    @given(st.integers(min_value=1, max_value=2048), st.integers(min_value=1, max_value=2048))
-    def test_property_output_format_preservation(self, width, height):
+    @settings(max_examples=50)
+    @given(st.integers(min_value=1, max_value=128), st.integers(min_value=1, max_value=128))
+    def test_property_output_format_preservation(self, processor, width, height):
         """
         Property 5: Output Format Preservation
         
@@ -366,175 +300,118 @@ class TestSaveOutput:
         Validates: Requirements 5.1
         """
         with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
             # Create a test image with random dimensions
             test_image = Image.new('RGBA', (width, height), color=(255, 0, 0, 255))
             
             # Save the image
             output_path = os.path.join(tmpdir, "test_output.png")
             
-            try:
-                processor.save_output(test_image, output_path)
+            processor.save_output(test_image, output_path)
+            
+            # Verify the file was created
+            assert os.path.exists(output_path), "Output file should be created"
+            
+            # Verify it can be read as a valid image
+            with Image.open(output_path) as saved_image:
+                # Verify it's in PNG format (check format attribute)
+                assert saved_image.format == 'PNG', \
+                    f"Output should be PNG format, got {saved_image.format}"
                 
-                # Verify the file was created
-                assert os.path.exists(output_path), "Output file should be created"
+                # Verify dimensions are preserved
+                assert saved_image.size == (width, height), \
+                    f"Output dimensions should be {width}x{height}, got {saved_image.size}"
                 
-                # Verify it can be read as a valid image
-                with Image.open(output_path) as saved_image:
-                    # Verify it's in PNG format (check format attribute)
-                    assert saved_image.format == 'PNG', \
-                        f"Output should be PNG format, got {saved_image.format}"
-                    
-                    # Verify dimensions are preserved
-                    assert saved_image.size == (width, height), \
-                        f"Output dimensions should be {width}x{height}, got {saved_image.size}"
-                    
-                    # Verify the image is readable and valid
-                    saved_image.load()  # This will raise an exception if image is corrupted
-                    
-            finally:
-                # Clean up
-                if os.path.exists(output_path):
-                    try:
-                        os.unlink(output_path)
-                    except (PermissionError, FileNotFoundError):
-                        pass
-
+                # Verify the PNG is intact (chunk CRCs and structure) without
+                # decompressing the pixels; format and size above come from the
+                # header, and the image is unusable after verify()
+                saved_image.verify()  # This will raise an exception if image is corrupted
     
-    def test_save_to_specified_path(self):
+    def test_save_to_specified_path(self, processor, tmp_path):
         """
         Test saving output to a specified path (example).
         
         Requirements: 5.2
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Create a test image
-            test_image = Image.new('RGBA', (1024, 1024), color=(0, 255, 0, 255))
-            
-            # Specify output path
-            output_path = os.path.join(tmpdir, "my_custom_output.png")
-            
-            # Save the image
-            processor.save_output(test_image, output_path)
-            
-            # Verify the file was created at the specified path
-            assert os.path.exists(output_path), "Output file should be created at specified path"
-            
-            # Verify it's a valid PNG
-            with Image.open(output_path) as saved_image:
-                assert saved_image.format == 'PNG'
-                assert saved_image.size == (1024, 1024)
+        # Create a test image
+        test_image = Image.new('RGBA', (1024, 1024), color=(0, 255, 0, 255))
+        
+        # Specify output path
+        output_path = str(tmp_path / "my_custom_output.png")
+        
+        # Save the image
+        processor.save_output(test_image, output_path)
+        
+        # Verify the file was created at the specified path
+        assert os.path.exists(output_path), "Output file should be created at specified path"
+        
+        # Verify it's a valid PNG
+        with Image.open(output_path) as saved_image:
+            assert saved_image.format == 'PNG'
+            assert saved_image.size == (1024, 1024)
     
-    def test_use_default_name(self):
+    def test_use_default_name(self, processor, tmp_path, monkeypatch):
         """
         Test using default name when path not specified (example).
         
         Requirements: 5.3
         """
-        # Save current directory
-        original_dir = os.getcwd()
+        # Change to temp directory (restored automatically after the test)
+        monkeypatch.chdir(tmp_path)
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            try:
-                # Change to temp directory
-                os.chdir(tmpdir)
-                
-                # Create a dummy block for the palette
-                dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-                dummy_path = os.path.join(tmpdir, "dummy.png")
-                dummy_block.save(dummy_path)
-                
-                palette = BlockPalette(tmpdir)
-                palette.load_blocks()
-                matcher = ColorMatcher(palette)
-                processor = SkinProcessor(palette, matcher)
-                
-                # Create a test image
-                test_image = Image.new('RGBA', (1024, 1024), color=(0, 0, 255, 255))
-                
-                # Save without specifying path (should use default)
-                processor.save_output(test_image, None)
-                
-                # Verify default file was created
-                default_path = "minecraft_skin_output.png"
-                assert os.path.exists(default_path), "Default output file should be created"
-                
-                # Verify it's a valid PNG
-                with Image.open(default_path) as saved_image:
-                    assert saved_image.format == 'PNG'
-                    assert saved_image.size == (1024, 1024)
-                
-                # Clean up
-                os.unlink(default_path)
-            finally:
-                # Restore original directory
-                os.chdir(original_dir)
+        # Create a test image
+        test_image = Image.new('RGBA', (1024, 1024), color=(0, 0, 255, 255))
+        
+        # Save without specifying path (should use default)
+        processor.save_output(test_image, None)
+        
+        # Verify default file was created
+        default_path = "minecraft_skin_output.png"
+        assert os.path.exists(default_path), "Default output file should be created"
+        
+        # Verify it's a valid PNG
+        with Image.open(default_path) as saved_image:
+            assert saved_image.format == 'PNG'
+            assert saved_image.size == (1024, 1024)
     
-    def test_handle_existing_files(self):
+    def test_handle_existing_files(self, processor, tmp_path):
         """
         Test handling of existing files by adding suffix (example).
         
         Requirements: 5.4
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a dummy block for the palette
-            dummy_block = Image.new('RGB', (16, 16), color=(128, 128, 128))
-            dummy_path = os.path.join(tmpdir, "dummy.png")
-            dummy_block.save(dummy_path)
-            
-            palette = BlockPalette(tmpdir)
-            palette.load_blocks()
-            matcher = ColorMatcher(palette)
-            processor = SkinProcessor(palette, matcher)
-            
-            # Create test images
-            test_image1 = Image.new('RGBA', (1024, 1024), color=(255, 0, 0, 255))
-            test_image2 = Image.new('RGBA', (1024, 1024), color=(0, 255, 0, 255))
-            test_image3 = Image.new('RGBA', (1024, 1024), color=(0, 0, 255, 255))
-            
-            # Specify the same output path
-            output_path = os.path.join(tmpdir, "output.png")
-            
-            # Save first image
-            processor.save_output(test_image1, output_path)
-            assert os.path.exists(output_path), "First file should be created"
-            
-            # Save second image with same path - should create output_1.png
-            processor.save_output(test_image2, output_path)
-            output_path_1 = os.path.join(tmpdir, "output_1.png")
-            assert os.path.exists(output_path_1), "Second file should be created with _1 suffix"
-            
-            # Save third image with same path - should create output_2.png
-            processor.save_output(test_image3, output_path)
-            output_path_2 = os.path.join(tmpdir, "output_2.png")
-            assert os.path.exists(output_path_2), "Third file should be created with _2 suffix"
-            
-            # Verify all three files exist and are different
-            assert os.path.exists(output_path)
-            assert os.path.exists(output_path_1)
-            assert os.path.exists(output_path_2)
-            
-            # Verify they're all valid PNGs
-            for path in [output_path, output_path_1, output_path_2]:
-                with Image.open(path) as img:
-                    assert img.format == 'PNG'
-                    assert img.size == (1024, 1024)
+        # Create test images; the naming logic does not depend on the image
+        # size, so 1x1 images keep the PNG encoding negligible
+        test_image1 = Image.new('RGBA', (1, 1), color=(255, 0, 0, 255))
+        test_image2 = Image.new('RGBA', (1, 1), color=(0, 255, 0, 255))
+        test_image3 = Image.new('RGBA', (1, 1), color=(0, 0, 255, 255))
+        
+        # Specify the same output path
+        output_path = str(tmp_path / "output.png")
+        
+        # Save first image
+        processor.save_output(test_image1, output_path)
+        assert os.path.exists(output_path), "First file should be created"
+        
+        # Save second image with same path - should create output_1.png
+        processor.save_output(test_image2, output_path)
+        output_path_1 = str(tmp_path / "output_1.png")
+        assert os.path.exists(output_path_1), "Second file should be created with _1 suffix"
+        
+        # Save third image with same path - should create output_2.png
+        processor.save_output(test_image3, output_path)
+        output_path_2 = str(tmp_path / "output_2.png")
+        assert os.path.exists(output_path_2), "Third file should be created with _2 suffix"
+        
+        # Verify all three files exist and are different
+        assert os.path.exists(output_path)
+        assert os.path.exists(output_path_1)
+        assert os.path.exists(output_path_2)
+        
+        # Verify they're all valid PNGs, each holding the image saved to it
+        for path, test_image in [(output_path, test_image1),
+                                 (output_path_1, test_image2),
+                                 (output_path_2, test_image3)]:
+            with Image.open(path) as img:
+                assert img.format == 'PNG'
+                assert img.size == (1, 1)
+                assert img.convert('RGBA').getpixel((0, 0)) == test_image.getpixel((0, 0))
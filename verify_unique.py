@@ -1,58 +1,56 @@
 from PIL import Image
-from collections import Counter
+import numpy as np
+
+from minecraft_skin_pixelart.color_matcher import ColorMatcher
 
 # Load skin and output
 skin = Image.open('your_skin.png').convert('RGBA')
 output = Image.open('output_unique.png').convert('RGBA')
+skin_arr = np.asarray(skin)
+output_arr = np.asarray(output)
 
-# Get unique colors from skin
-skin_pixels = list(skin.getdata())
-skin_colors = set()
-for p in skin_pixels:
-    if p[3] >= 128:  # Opaque
-        skin_colors.add(p[:3])
+# Get unique colors from skin (with each opaque pixel's color index), made
+# unique as packed integers rather than as rows of three channels
+opaque = skin_arr[..., 3] >= 128
+opaque_rgb = skin_arr[opaque][:, :3]
+packed, first_index, inverse, counts = np.unique(
+    ColorMatcher.pack_colors(opaque_rgb),
+    return_index=True, return_inverse=True, return_counts=True
+)
+colors = ColorMatcher.unpack_colors(packed)
 
 print(f"=== SKIN ANALYSIS ===")
-print(f"Unique colors in skin: {len(skin_colors)}")
+print(f"Unique colors in skin: {len(colors)}")
 
-# Count frequency of each color
-color_freq = Counter()
-for p in skin_pixels:
-    if p[3] >= 128:
-        color_freq[p[:3]] += 1
+# Frequency of each color, most common first (ties in order of appearance)
+order = np.lexsort((first_index, -counts))
+color_freq = {tuple(colors[i].tolist()): int(counts[i]) for i in order}
 
 print("\nTop 10 most common colors:")
-for i, (color, count) in enumerate(color_freq.most_common(10), 1):
+for i, (color, count) in enumerate(list(color_freq.items())[:10], 1):
     print(f"{i:2d}. RGB{color} - {count} pixels")
 
 # Now check output - each 16x16 block should be unique for unique input colors
 print(f"\n=== OUTPUT ANALYSIS ===")
 
-# Map each skin pixel to its output block
-skin_to_block = {}
-for y in range(64):
-    for x in range(64):
-        skin_color = skin.getpixel((x, y))
-        if skin_color[3] < 128:
-            continue
-        
-        rgb = skin_color[:3]
-        
-        # Get the corresponding 16x16 block from output
-        output_x = x * 16
-        output_y = y * 16
-        
-        # Sample the center pixel of the block
-        block_sample = output.getpixel((output_x + 8, output_y + 8))[:3]
-        
-        if rgb not in skin_to_block:
-            skin_to_block[rgb] = block_sample
-        else:
-            # Verify it's the same block
-            if skin_to_block[rgb] != block_sample:
-                print(f"ERROR: Color RGB{rgb} mapped to different blocks!")
-                print(f"  First: RGB{skin_to_block[rgb]}")
-                print(f"  Now:   RGB{block_sample}")
+# Map each skin pixel to its output block by sampling the center pixel
+# of the corresponding 16x16 block
+block_samples = output_arr[8::16, 8::16, :3][opaque]
+
+# Each color maps to the block at its first pixel; every other pixel of
+# that color must have sampled the same block
+first_samples = block_samples[first_index]
+for i in np.flatnonzero((block_samples != first_samples[inverse]).any(axis=1)):
+    rgb = tuple(opaque_rgb[i].tolist())
+    print(f"ERROR: Color RGB{rgb} mapped to different blocks!")
+    print(f"  First: RGB{tuple(first_samples[inverse[i]].tolist())}")
+    print(f"  Now:   RGB{tuple(block_samples[i].tolist())}")
+
+# Colors in order of first appearance
+skin_to_block = {
+    tuple(colors[i].tolist()): tuple(first_samples[i].tolist())
+    for i in np.argsort(first_index)
+}
 
 print(f"Unique blocks used: {len(set(skin_to_block.values()))}")
 print(f"Unique colors in skin: {len(skin_to_block)}")
@@ -1,33 +1,34 @@
 from PIL import Image
-from collections import Counter, defaultdict
+import numpy as np
+from collections import defaultdict
 
 # Load skin and output
 skin = Image.open('your_skin.png').convert('RGBA')
 output = Image.open('output_unique.png').convert('RGBA')
+skin_arr = np.asarray(skin)
+output_arr = np.asarray(output)[..., :3]
 
-# Map each skin color to all block samples
-skin_to_blocks = defaultdict(set)
+# Sample multiple pixels from every 16x16 output block at once to identify
+# it: rows and columns 0, 8 and 15 of each block, giving (64, 64, 9, 3)
+offsets = (np.arange(64)[:, None] * 16 + np.array([0, 8, 15])).ravel()
+signatures = output_arr[offsets[:, None], offsets[None, :]]
+signatures = signatures.reshape(64, 3, 64, 3, 3).transpose(0, 2, 1, 3, 4).reshape(64, 64, 9, 3)
+
+# Opaque skin pixels and their block signatures, in pixel order
+opaque = skin_arr[..., 3] >= 128
+opaque_rgb = skin_arr[opaque][:, :3]
+opaque_signatures = signatures[opaque].reshape(-1, 27)
 
-for y in range(64):
-    for x in range(64):
-        skin_color = skin.getpixel((x, y))
-        if skin_color[3] < 128:
-            continue
-        
-        rgb = skin_color[:3]
-        
-        # Get the corresponding 16x16 block from output
-        output_x = x * 16
-        output_y = y * 16
-        
-        # Sample multiple pixels from the block to identify it
-        block_signature = []
-        for dy in [0, 8, 15]:
-            for dx in [0, 8, 15]:
-                px = output.getpixel((output_x + dx, output_y + dy))[:3]
-                block_signature.append(px)
-        
-        skin_to_blocks[rgb].add(tuple(block_signature))
+# Map each skin color to all block samples, visiting every distinct
+# (color, signature) pair once at its first pixel
+_, first_index = np.unique(
+    np.concatenate([opaque_rgb, opaque_signatures], axis=1), axis=0, return_index=True
+)
+skin_to_blocks = defaultdict(set)
+for i in np.sort(first_index):
+    rgb = tuple(opaque_rgb[i].tolist())
+    block_signature = tuple(map(tuple, opaque_signatures[i].reshape(9, 3).tolist()))
+    skin_to_blocks[rgb].add(block_signature)
 
 print("=== CHECKING FOR DUPLICATE BLOCKS ===\n")
 